@@ -3,22 +3,24 @@ from fastapi.security import OAuth2PasswordRequestForm
 
 from app.services.auth import AuthService
 from app.schemas.user import UserCreate, UserRead, Token
+from app.dependencies.auth import get_current_user
+from app.dependencies.ratelimit import limit_login, limit_register
 
 router = APIRouter()
 
-@router.post("/register", response_model=UserRead)
-def register(
+@router.post("/register", response_model=UserRead, dependencies=[Depends(limit_register)])
+async def register(
     user_in: UserCreate,
     service: AuthService = Depends()
 ):
     """
     Register a new user. FastAPI will inject AuthService,
-    which in turn gets a real DB session via get_db().
+    which in turn gets a real DB session via get_async_db().
     """
-    return service.register(user_in)
+    return await service.register(user_in)
 
-@router.post("/login", response_model=Token)
-def login(
+@router.post("/login", response_model=Token, dependencies=[Depends(limit_login)])
+async def login(
     form_data: OAuth2PasswordRequestForm = Depends(),
     service: AuthService = Depends()
 ):
@@ -26,11 +28,11 @@ def login(
     Authenticate credentials via form-data (username/password)
     and return a JWT access token.
     """
-    return service.authenticate(form_data.username, form_data.password)
+    return await service.authenticate(form_data.username, form_data.password)
 
 @router.get("/me", response_model=UserRead)
-def me(
-    current_user=Depends()
+async def me(
+    current_user: UserRead = Depends(get_current_user)
 ):
     """
     Return details about the currently authenticated user.
@@ -0,0 +1,138 @@
+from typing import AsyncIterator
+
+from fastapi import APIRouter, Depends, HTTPException, Request, status
+from pydantic import ValidationError
+from sqlalchemy.exc import IntegrityError
+
+from app.api.issue import get_issue_repo
+from app.core.config import settings
+from app.crud.issue import AsyncIssueRepository
+from app.dependencies.ratelimit import limit_issue_writes
+from app.dependencies.auth import require_role
+from app.models.user import RoleEnum
+from app.schemas.issues import BulkResult, BulkStatusUpdate, IssueImport
+from app.schemas.user import UserRead
+from app.utils import pubsub_instance
+
+router = APIRouter(prefix="/issues", tags=["issues"])
+
+NDJSON_TYPES = {"application/x-ndjson", "application/jsonl", "application/json-seq"}
+
+# RFC 7464 (application/json-seq) starts every record with an ASCII RS.
+RECORD_SEPARATOR = b"\x1e"
+
+async def iter_ndjson(request: Request) -> AsyncIterator[bytes]:
+    """Yield one JSON document per line as the request body streams in."""
+    pending = b""
+    async for chunk in request.stream():
+        pending += chunk
+        *lines, pending = pending.split(b"\n")
+        for line in lines:
+            line = line.strip().lstrip(RECORD_SEPARATOR)
+            if line:
+                yield line
+    pending = pending.strip().lstrip(RECORD_SEPARATOR)
+    if pending:
+        yield pending
+
+async def iter_json_array(request: Request) -> AsyncIterator[dict]:
+    try:
+        items = await request.json()
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Body is not valid JSON")
+    if not isinstance(items, list):
+        raise HTTPException(status_code=400, detail="Expected a JSON array of issues")
+    for item in items:
+        yield item
+
+@router.post(
+    "/bulk",
+    response_model=BulkResult,
+    dependencies=[Depends(limit_issue_writes)],
+    status_code=status.HTTP_201_CREATED,
+    openapi_extra={"requestBody": {"content": {
+        "application/json": {"schema": {"type": "array", "items": IssueImport.model_json_schema()}},
+        "application/x-ndjson": {"schema": IssueImport.model_json_schema()},
+    }}},
+)
+async def bulk_create_issues(
+    request: Request,
+    current_user: UserRead = Depends(require_role(RoleEnum.ADMIN)),
+    repo: AsyncIssueRepository = Depends(get_issue_repo),
+):
+    """
+    Import issues from a JSON array or an NDJSON stream (one issue per line).
+    Rows are inserted and committed in chunks of BULK_CHUNK_SIZE. If an item
+    is invalid the import stops there; earlier chunks stay committed and the
+    error reports how many were created. One `issues_bulk_created` event is
+    published for the whole request.
+    """
+    content_type = request.headers.get("content-type", "").split(";")[0].strip()
+    if content_type in NDJSON_TYPES:
+        documents = iter_ndjson(request)
+    elif content_type == "application/json":
+        documents = iter_json_array(request)
+    else:
+        raise HTTPException(status_code=415, detail="Send application/json or application/x-ndjson")
+
+    created = 0
+    batch: list[IssueImport] = []
+    position = 0
+    try:
+        async for document in documents:
+            position += 1
+            try:
+                if isinstance(document, bytes):
+                    batch.append(IssueImport.model_validate_json(document))
+                else:
+                    batch.append(IssueImport.model_validate(document))
+            except ValidationError as exc:
+                raise HTTPException(
+                    status_code=422,
+                    detail={"item": position, "errors": exc.errors(include_url=False, include_input=False), "created": created},
+                )
+            if len(batch) >= settings.BULK_CHUNK_SIZE:
+                created += await repo.bulk_create(batch, reporter_id=current_user.id)
+                batch = []
+        if batch:
+            created += await repo.bulk_create(batch, reporter_id=current_user.id)
+    except IntegrityError:
+        await repo.db.rollback()
+        raise HTTPException(
+            status_code=422,
+            detail={"errors": "A chunk referenced an unknown reporter_id", "created": created},
+        )
+    finally:
+        if created:
+            await pubsub_instance.publish({"type": "issues_bulk_created", "count": created})
+
+    return {"count": created}
+
+@router.patch(
+    "/status",
+    response_model=BulkResult,
+    dependencies=[Depends(limit_issue_writes)],
+)
+async def bulk_update_status(
+    update_in: BulkStatusUpdate,
+    current_user: UserRead = Depends(require_role(RoleEnum.MAINTAINER, RoleEnum.ADMIN)),
+    repo: AsyncIssueRepository = Depends(get_issue_repo),
+):
+    """
+    Move issues, selected by id list or by filter, to a new status in
+    chunked transactions, then publish one `issues_bulk_updated` event.
+    """
+    filters = update_in.filter.model_dump() if update_in.filter else {}
+    updated = await repo.bulk_update_status(
+        update_in.status,
+        chunk_size=settings.BULK_CHUNK_SIZE,
+        ids=update_in.ids,
+        **filters,
+    )
+    if updated:
+        await pubsub_instance.publish({
+            "type": "issues_bulk_updated",
+            "status": update_in.status.value,
+            "count": updated,
+        })
+    return {"count": updated}
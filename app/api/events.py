@@ -1,23 +1,80 @@
+import asyncio
 import json
-from fastapi import APIRouter
+from typing import Optional
+
+from fastapi import APIRouter, Header, Query
 from fastapi.responses import StreamingResponse
+from app.core.config import settings
+from app.schemas.issues import SeverityEnum
 from app.utils import pubsub_instance
+from app.utils.pubsub import SubscriptionClosed
 
 router = APIRouter()
 
+def format_event(msg: dict) -> str:
+    event_id = msg.get("event_id")
+    if event_id is None:
+        return f"data: {json.dumps(msg)}\n\n"
+    return f"id: {event_id}\ndata: {json.dumps(msg)}\n\n"
+
+def event_filter(types: Optional[list[str]], severities: Optional[list[SeverityEnum]]):
+    """Build a predicate for the optional ?type= and ?severity= filters."""
+    wanted_types = set(types or ())
+    wanted_severities = {s.value for s in severities or ()}
+
+    def matches(msg: dict) -> bool:
+        if wanted_types and msg.get("type") not in wanted_types:
+            return False
+        # Events without an issue body (e.g. deletions) pass the severity filter.
+        severity = (msg.get("issue") or {}).get("severity")
+        if wanted_severities and severity is not None and severity not in wanted_severities:
+            return False
+        return True
+    return matches
+
 @router.get("/events")
-async def events():
+async def events(
+    event_type: Optional[list[str]] = Query(None, alias="type", description="Only these event types"),
+    severity: Optional[list[SeverityEnum]] = Query(None, description="Only issues of these severities"),
+    last_event_id: Optional[str] = Header(None),
+):
     """
     Server-Sent Events stream: clients subscribe here.
+
+    Every event carries an `id:`; reconnecting with Last-Event-ID replays
+    what was missed from a bounded buffer. If the buffer no longer reaches
+    back that far a `replay_gap` event tells the client to refetch.
+    Comment lines are sent as heartbeats while the stream is idle.
     """
-    queue = await pubsub_instance.subscribe()
+    matches = event_filter(event_type, severity)
+    subscription = await pubsub_instance.subscribe()
+    backlog, complete = [], True
+    if last_event_id and last_event_id.isdigit():
+        backlog, complete = pubsub_instance.replay(int(last_event_id))
 
     async def event_generator():
         try:
+            if not complete:
+                yield f"data: {json.dumps({'type': 'replay_gap'})}\n\n"
+            for msg in backlog:
+                if matches(msg):
+                    yield format_event(msg)
             while True:
-                msg = await queue.get()
-                yield f"data: {json.dumps(msg)}\n\n"
+                try:
+                    msg = await asyncio.wait_for(subscription.get(), settings.SSE_HEARTBEAT_SECONDS)
+                except asyncio.TimeoutError:
+                    yield ": keepalive\n\n"
+                    continue
+                if matches(msg):
+                    yield format_event(msg)
+        except SubscriptionClosed:
+            # Evicted for falling too far behind; the client will reconnect.
+            return
         finally:
-            await pubsub_instance.unsubscribe(queue)
+            await pubsub_instance.unsubscribe(subscription)
 
-    return StreamingResponse(event_generator(), media_type="text/event-stream")
+    return StreamingResponse(
+        event_generator(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
@@ -1,27 +1,85 @@
-from typing import List, Optional
+import hashlib
+import mimetypes
+import os
+import posixpath
+from typing import Literal, Optional
+from urllib.parse import quote
 
-from fastapi import APIRouter, Depends, Form, File, UploadFile, HTTPException, status
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, Form, File, UploadFile, HTTPException, Header, Query, Response, status
+import orjson
+from fastapi.responses import FileResponse, ORJSONResponse, StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.crud.issue import IssueRepository
-from app.crud.attachment import AttachmentRepository
-from app.schemas.issues import IssueCreate, IssueRead, IssueUpdate, SeverityEnum
-from app.dependencies.auth import get_db, get_current_user, require_role
-from app.models.user import RoleEnum, User
-from app.utils.storage import save_upload_file
+from app.crud.issue import AsyncIssueRepository
+from app.crud.attachment import AsyncAttachmentRepository
+from app.crud.search import AsyncSearchRepository
+from app.crud.idempotency import AsyncIdempotencyRepository
+from app.crud.issue_version import current_version
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.models.issues import Issue
+from app.schemas.issues import IssueCreate, IssuePage, IssueRead, IssueSearchPage, IssueUpdate, SeverityEnum, StatusEnum
+from app.database.session import AsyncSessionLocal
+from app.dependencies.ratelimit import limit_issue_writes
+from app.dependencies.auth import get_async_db, get_current_user, require_role
+from app.models.user import RoleEnum
+from app.schemas.user import UserRead
+from app.utils.storage import UPLOAD_DIR, UploadTooLarge, attachment_store, save_upload_file
+from app.utils.http_cache import collection_etag, etag_matches, http_date, not_modified
+from app.utils.pagination import decode_cursor, encode_cursor
+from app.utils.export import csv_chunk, ndjson_chunk
+from app.utils.serialization import issue_dict
 from app.utils import pubsub_instance  
 
-router = APIRouter(prefix="/issues", tags=["issues"])
+router = APIRouter(prefix="/issues", tags=["issues"], default_response_class=ORJSONResponse)
 
-def get_issue_repo(db: Session = Depends(get_db)) -> IssueRepository:
-    return IssueRepository(db)
+# Keyed by ETag, which changes with the data, so entries never go stale;
+# old ones simply age out.
+response_cache = None
+if settings.ISSUE_RESPONSE_CACHE_ENABLED:
+    response_cache = TTLCache(settings.ISSUE_RESPONSE_CACHE_SIZE, settings.ISSUE_RESPONSE_CACHE_TTL_SECONDS)
 
-def get_attach_repo(db: Session = Depends(get_db)) -> AttachmentRepository:
-    return AttachmentRepository(db)
+CACHE_HEADERS = {"Cache-Control": "private, no-cache"}
+
+def issue_etag(issue: Issue) -> str:
+    # Attachments are added after the issue row is written, so count them too.
+    return f'W/"{issue.id}-{issue.updated_at.timestamp():.6f}-{len(issue.attachments)}"'
+
+def json_response(body: bytes, headers: dict) -> Response:
+    return Response(content=body, media_type="application/json", headers=headers)
+
+def get_issue_repo(db: AsyncSession = Depends(get_async_db)) -> AsyncIssueRepository:
+    return AsyncIssueRepository(db)
+
+def get_attach_repo(db: AsyncSession = Depends(get_async_db)) -> AsyncAttachmentRepository:
+    return AsyncAttachmentRepository(db)
+
+def get_idempotency_repo(db: AsyncSession = Depends(get_async_db)) -> AsyncIdempotencyRepository:
+    return AsyncIdempotencyRepository(db)
+
+def request_fingerprint(*fields) -> str:
+    """Hash of what identifies a create request, to spot a key reused for something else."""
+    return hashlib.sha256(orjson.dumps(fields)).hexdigest()
+
+async def get_visible_issue(
+    issue_id: int,
+    current_user: UserRead = Depends(get_current_user),
+    repo: AsyncIssueRepository = Depends(get_issue_repo),
+) -> Issue:
+    """Load an issue, allowing reporters to see only their own."""
+    issue = await repo.get(issue_id)
+    if not issue:
+        raise HTTPException(status_code=404, detail="Issue not found")
+
+    if current_user.role == RoleEnum.REPORTER and issue.reporter_id != current_user.id:
+        raise HTTPException(status_code=403, detail="Not permitted to view this issue")
+
+    return issue
 
 @router.post(
     "/",
     response_model=IssueRead,
+    dependencies=[Depends(limit_issue_writes)],
     status_code=status.HTTP_201_CREATED
 )
 async def create_issue(
@@ -29,117 +87,307 @@ async def create_issue(
     description: str = Form(..., description="Issue description (Markdown)"),
     severity: SeverityEnum = Form(SeverityEnum.LOW, description="Issue severity"),
     file: Optional[UploadFile] = File(None, description="Optional attachment"),
-    current_user: User = Depends(require_role(RoleEnum.REPORTER, RoleEnum.ADMIN)),
-    repo: IssueRepository = Depends(get_issue_repo),
-    attach_repo: AttachmentRepository = Depends(get_attach_repo),
+    idempotency_key: Optional[str] = Header(None, max_length=255, description="Makes retries of this request safe"),
+    current_user: UserRead = Depends(require_role(RoleEnum.REPORTER, RoleEnum.ADMIN)),
+    repo: AsyncIssueRepository = Depends(get_issue_repo),
+    attach_repo: AsyncAttachmentRepository = Depends(get_attach_repo),
+    idem_repo: AsyncIdempotencyRepository = Depends(get_idempotency_repo),
 ):
-    issue_in = IssueCreate(title=title, description=description, severity=severity)
-    issue = repo.create(issue_in, reporter_id=current_user.id)
+    """
+    Create an issue, optionally with one attachment. With an
+    Idempotency-Key, a retry of the same request replays the first response
+    instead of creating the issue again; reusing the key for a different
+    request is rejected with 422, and a retry that arrives while the first
+    is still running gets 409.
+    """
+    stored = None
+    try:
+        if file:
+            # Staged before reserving so the fingerprint covers the content.
+            try:
+                stored = await save_upload_file(file)
+            except UploadTooLarge as exc:
+                raise HTTPException(status_code=413, detail=str(exc))
 
-    await pubsub_instance.publish({
-        "type": "issue_created",
-        "issue": IssueRead.from_orm(issue).model_dump(),
-    })
+        if idempotency_key:
+            fingerprint = request_fingerprint(
+                title, description, severity.value,
+                file.filename if file else None, stored.sha256 if stored else None,
+            )
+            previous = await idem_repo.reserve(current_user.id, idempotency_key, fingerprint)
+            if previous is not None:
+                if previous.fingerprint != fingerprint:
+                    raise HTTPException(status_code=422, detail="Idempotency-Key was already used for a different request")
+                if previous.status_code is None:
+                    raise HTTPException(status_code=409, detail="A request with this Idempotency-Key is still in progress")
+                return Response(
+                    content=previous.response,
+                    status_code=previous.status_code,
+                    media_type="application/json",
+                    headers={"Idempotent-Replayed": "true"},
+                )
 
-    if file:
-        path = save_upload_file(file)
-        attach_repo.create_issue_with_attachment( 
-            issue_id=issue.id,
-            filename=file.filename,
-            filepath=path,
-        )
-        repo.db.refresh(issue) 
+        # The issue, its attachment and the stored response commit together,
+        # so a failure part-way leaves nothing behind for a retry to duplicate.
+        try:
+            issue_in = IssueCreate(title=title, description=description, severity=severity)
+            issue = await repo.create(issue_in, reporter_id=current_user.id, commit=False)
 
-    return issue
+            if stored:
+                await attach_repo.create_issue_with_attachment(
+                    issue_id=issue.id,
+                    filename=file.filename,
+                    stored=stored,
+                    commit=False,
+                )
+                await repo.db.refresh(issue)
+
+            # Serialize once: the same dict is the event payload and the response.
+            payload = issue_dict(issue)
+            if idempotency_key:
+                await idem_repo.complete(
+                    current_user.id, idempotency_key, status.HTTP_201_CREATED, orjson.dumps(payload), commit=False
+                )
+            await repo.commit()
+        except Exception:
+            if stored:
+                attachment_store.abandon(stored)
+            if idempotency_key:
+                await idem_repo.release(current_user.id, idempotency_key)
+            raise
+    finally:
+        if stored:
+            attachment_store.discard(stored)
+
+    await pubsub_instance.publish({"type": "issue_created", "issue": payload})
+    return ORJSONResponse(payload, status_code=status.HTTP_201_CREATED)
 
 @router.get(
     "/",
-    response_model=List[IssueRead]
+    response_model=IssuePage
 )
-def list_issues(
-    current_user: User = Depends(get_current_user),
-    repo: IssueRepository = Depends(get_issue_repo),
+async def list_issues(
+    limit: int = Query(50, ge=1, le=200),
+    cursor: Optional[str] = Query(None, description="Opaque cursor from a previous page"),
+    status_filter: Optional[StatusEnum] = Query(None, alias="status"),
+    severity: Optional[SeverityEnum] = None,
+    reporter_id: Optional[int] = None,
+    if_none_match: Optional[str] = Header(None),
+    current_user: UserRead = Depends(get_current_user),
+    repo: AsyncIssueRepository = Depends(get_issue_repo),
 ):
+    """
+    Keyset-paginated issue list. The ETag tracks the issue collection
+    version, so polling clients get 304 until an issue changes.
+    """
     if current_user.role == RoleEnum.REPORTER:
-        return repo.list_by_reporter(current_user.id)
-    return repo.list_all()
+        reporter_id = current_user.id
+
+    try:
+        position = decode_cursor(cursor) if cursor else None
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+    # The version is bumped in every issue write's transaction, so it is
+    # shared by all workers. Read it before the page: a write landing in
+    # between can only make the body newer than its ETag, never older.
+    version = await current_version(repo.db)
+    etag = collection_etag(version, limit, cursor, status_filter, severity, reporter_id)
+    headers = {**CACHE_HEADERS, "ETag": etag}
+    if etag_matches(if_none_match, etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    if response_cache is not None and (body := response_cache.get(etag)) is not None:
+        return json_response(body, headers)
+
+    issues = await repo.list_page(
+        limit=limit + 1,
+        cursor=position,
+        status=status_filter,
+        severity=severity,
+        reporter_id=reporter_id,
+    )
+    next_cursor = None
+    if len(issues) > limit:
+        issues = issues[:limit]
+        next_cursor = encode_cursor(issues[-1].created_at, issues[-1].id)
+    body = orjson.dumps({"items": [issue_dict(issue) for issue in issues], "next_cursor": next_cursor})
+    if response_cache is not None:
+        response_cache.set(etag, body)
+    return json_response(body, headers)
+
+@router.get(
+    "/search",
+    response_model=IssueSearchPage
+)
+async def search_issues(
+    q: str = Query(..., min_length=1, max_length=200, description="Search terms"),
+    limit: int = Query(20, ge=1, le=100),
+    offset: int = Query(0, ge=0, le=10000),
+    current_user: UserRead = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db),
+):
+    """
+    Full-text search over issue titles and descriptions, best matches
+    first, with matched terms wrapped in <mark> in the highlights.
+    Reporters only find their own issues.
+    """
+    reporter_id = current_user.id if current_user.role == RoleEnum.REPORTER else None
+    hits = await AsyncSearchRepository(db).search(q, limit=limit, offset=offset, reporter_id=reporter_id)
+    return {"items": hits, "limit": limit, "offset": offset}
+
+@router.get("/export")
+async def export_issues(
+    format: Literal["ndjson", "csv"] = "ndjson",
+    status_filter: Optional[StatusEnum] = Query(None, alias="status"),
+    severity: Optional[SeverityEnum] = None,
+    reporter_id: Optional[int] = None,
+    current_user: UserRead = Depends(get_current_user),
+):
+    """
+    Stream every visible issue as NDJSON or CSV. Rows come from a
+    server-side cursor in chunks, so memory use does not grow with the
+    table. Reporters only export their own issues.
+    """
+    if current_user.role == RoleEnum.REPORTER:
+        reporter_id = current_user.id
+    filters = {"status": status_filter, "severity": severity, "reporter_id": reporter_id}
+
+    async def rows():
+        # The stream outlives the request's dependencies, so it needs its own session.
+        async with AsyncSessionLocal() as db:
+            repo = AsyncIssueRepository(db)
+            first = True
+            async for chunk in repo.stream_rows(settings.EXPORT_CHUNK_SIZE, **filters):
+                if format == "csv":
+                    yield csv_chunk(chunk, header=first)
+                else:
+                    yield ndjson_chunk(chunk)
+                first = False
+            if first and format == "csv":
+                yield csv_chunk([], header=True)
+
+    media_type = "text/csv" if format == "csv" else "application/x-ndjson"
+    return StreamingResponse(
+        rows(),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="issues.{format}"'},
+    )
 
 @router.get(
     "/{issue_id}",
     response_model=IssueRead
 )
-def get_issue(
-    issue_id: int,
-    current_user: User = Depends(get_current_user),
-    repo: IssueRepository = Depends(get_issue_repo),
+async def get_issue(
+    if_none_match: Optional[str] = Header(None),
+    if_modified_since: Optional[str] = Header(None),
+    issue: Issue = Depends(get_visible_issue),
 ):
-    issue = repo.get(issue_id)
-    if not issue:
-        raise HTTPException(status_code=404, detail="Issue not found")
+    """Fetch one issue; revalidates with ETag/Last-Modified from `updated_at`."""
+    etag = issue_etag(issue)
+    headers = {**CACHE_HEADERS, "ETag": etag, "Last-Modified": http_date(issue.updated_at)}
+    if not_modified(if_none_match, if_modified_since, etag, issue.updated_at):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
 
-    if current_user.role == RoleEnum.REPORTER and issue.reporter_id != current_user.id:
-        raise HTTPException(status_code=403, detail="Not permitted to view this issue")
+    body = response_cache.get(etag) if response_cache is not None else None
+    if body is None:
+        body = orjson.dumps(issue_dict(issue))
+        if response_cache is not None:
+            response_cache.set(etag, body)
+    return json_response(body, headers)
 
-    return issue
+@router.get(
+    "/{issue_id}/attachments/{attachment_id}",
+    response_class=FileResponse,
+)
+async def download_attachment(
+    attachment_id: int,
+    if_none_match: Optional[str] = Header(None),
+    issue: Issue = Depends(get_visible_issue),
+):
+    """
+    Download an attachment of a visible issue. The ETag is the content hash,
+    so unchanged files revalidate with 304; Range requests get partial
+    content.
+    """
+    attachment = next((a for a in issue.attachments if a.id == attachment_id), None)
+    if attachment is None:
+        raise HTTPException(status_code=404, detail="Attachment not found")
+
+    headers = {"Cache-Control": "private, no-cache"}
+    if attachment.content_hash:
+        headers["ETag"] = f'"{attachment.content_hash}"'
+        if etag_matches(if_none_match, headers["ETag"]):
+            return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    if settings.ATTACHMENT_ACCEL_REDIRECT_PREFIX:
+        relative = os.path.relpath(attachment.filepath, UPLOAD_DIR).replace(os.sep, "/")
+        headers["X-Accel-Redirect"] = posixpath.join(settings.ATTACHMENT_ACCEL_REDIRECT_PREFIX, relative)
+        headers["Content-Disposition"] = f"attachment; filename*=utf-8''{quote(attachment.filename)}"
+        media_type = mimetypes.guess_type(attachment.filename)[0] or "application/octet-stream"
+        return Response(headers=headers, media_type=media_type)
+
+    if not os.path.isfile(attachment.filepath):
+        raise HTTPException(status_code=404, detail="Attachment file missing")
+    # FileResponse answers Range/If-Range itself and uses the server's
+    # pathsend extension for zero-copy transfer where available.
+    return FileResponse(attachment.filepath, filename=attachment.filename, headers=headers)
 
 @router.patch(
     "/{issue_id}/status",
-    response_model=IssueRead
+    response_model=IssueRead,
+    dependencies=[Depends(limit_issue_writes)],
 )
 async def update_issue_status(
     issue_id: int,
     update_in: IssueUpdate,
-    current_user: User = Depends(require_role(RoleEnum.MAINTAINER, RoleEnum.ADMIN)),
-    repo: IssueRepository = Depends(get_issue_repo),
+    current_user: UserRead = Depends(require_role(RoleEnum.MAINTAINER, RoleEnum.ADMIN)),
+    repo: AsyncIssueRepository = Depends(get_issue_repo),
 ):
-    issue = repo.get(issue_id)
+    issue = await repo.get(issue_id)
     if not issue:
         raise HTTPException(status_code=404, detail="Issue not found")
 
-    updated_issue = repo.update_status(issue, update_in.status)
+    updated_issue = await repo.update_status(issue, update_in.status)
 
-    await pubsub_instance.publish({
-        "type": "issue_updated",
-        "issue": IssueRead.from_orm(updated_issue).model_dump(),
-    })
-
-    return updated_issue
+    payload = issue_dict(updated_issue)
+    await pubsub_instance.publish({"type": "issue_updated", "issue": payload})
+    return ORJSONResponse(payload)
 
 @router.put(
     "/{issue_id}",
-    response_model=IssueRead
+    response_model=IssueRead,
+    dependencies=[Depends(limit_issue_writes)],
 )
-def update_issue_details(
+async def update_issue_details(
     issue_id: int,
     issue_in: IssueCreate,
-    current_user: User = Depends(require_role(RoleEnum.ADMIN)),
-    repo: IssueRepository = Depends(get_issue_repo),
+    current_user: UserRead = Depends(require_role(RoleEnum.ADMIN)),
+    repo: AsyncIssueRepository = Depends(get_issue_repo),
 ):
-    issue = repo.get(issue_id)
+    issue = await repo.get(issue_id)
     if not issue:
         raise HTTPException(status_code=404, detail="Issue not found")
 
-    issue.title = issue_in.title
-    issue.description = issue_in.description
-    issue.severity = issue_in.severity
-    repo.db.commit()
-    repo.db.refresh(issue)
-    return issue
+    updated_issue = await repo.update_details(issue, issue_in)
+
+    payload = issue_dict(updated_issue)
+    await pubsub_instance.publish({"type": "issue_updated", "issue": payload})
+    return ORJSONResponse(payload)
 
 @router.delete(
     "/{issue_id}",
-    status_code=status.HTTP_204_NO_CONTENT
+    status_code=status.HTTP_204_NO_CONTENT,
+    dependencies=[Depends(limit_issue_writes)],
 )
 async def delete_issue(
     issue_id: int,
-    current_user: User = Depends(require_role(RoleEnum.ADMIN)),
-    repo: IssueRepository = Depends(get_issue_repo),
+    current_user: UserRead = Depends(require_role(RoleEnum.ADMIN)),
+    repo: AsyncIssueRepository = Depends(get_issue_repo),
 ):
-    issue = repo.get(issue_id)
+    issue = await repo.get(issue_id)
     if not issue:
         raise HTTPException(status_code=404, detail="Issue not found")
-    repo.db.delete(issue)
-    repo.db.commit()
+    await repo.delete(issue)
     await pubsub_instance.publish({
         "type": "issue_deleted",
         "issue_id": issue_id,
@@ -0,0 +1,88 @@
+import hmac
+
+from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.responses import PlainTextResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.metrics import render_histograms
+from app.core.security import PasswordHasher
+from app.database.pool import async_pool_metrics, sync_pool_metrics
+from app.dependencies.auth import get_async_db, get_current_user, oauth2_scheme
+from app.models.user import RoleEnum
+from app.utils import pubsub_instance
+from app.utils.scheduler import job_stats
+
+router = APIRouter()
+
+# snapshot() keys that only ever grow are counters; the rest are gauges.
+POOL_COUNTERS = {"checkouts", "timeouts", "wait_seconds_total", "hold_seconds_total"}
+
+def metric(lines: list[str], name: str, kind: str, help: str, samples: list[tuple[str, float]]) -> None:
+    lines.append(f"# HELP {name} {help}")
+    lines.append(f"# TYPE {name} {kind}")
+    lines.extend(f"{name}{labels} {value}" for labels, value in samples)
+
+def pool_lines() -> list[str]:
+    lines = []
+    snapshots = {m.name: m.snapshot() for m in (sync_pool_metrics, async_pool_metrics)}
+    for key in snapshots["sync"]:
+        kind = "counter" if key in POOL_COUNTERS else "gauge"
+        metric(lines, f"db_pool_{key}", kind, f"Connection pool {key.replace('_', ' ')}.", [
+            (f'{{pool="{name}"}}', snapshot[key]) for name, snapshot in snapshots.items()
+        ])
+    return lines
+
+def job_lines() -> list[str]:
+    lines = []
+    jobs = sorted(job_stats.items())
+    for field, kind in (("runs", "counter"), ("failures", "counter"), ("skipped", "counter"),
+                        ("total_duration_seconds", "counter"), ("last_duration_seconds", "gauge")):
+        metric(lines, f"scheduler_job_{field}", kind, f"Scheduled job {field.replace('_', ' ')} in this process.", [
+            (f'{{job="{name}"}}', getattr(stats, field))
+            for name, stats in jobs
+            if getattr(stats, field) is not None
+        ])
+    return lines
+
+def pubsub_lines() -> list[str]:
+    lines = []
+    stats = pubsub_instance.stats()
+    subscribers = stats["lag"]
+    metric(lines, "pubsub_subscribers", "gauge", "Connected event subscribers.", [("", stats["subscribers"])])
+    metric(lines, "pubsub_evicted_total", "counter", "Subscribers evicted for falling behind.", [("", stats["evicted"])])
+    metric(lines, "pubsub_lag_max", "gauge", "Largest current subscriber backlog.", [
+        ("", max((s["lag"] for s in subscribers), default=0))
+    ])
+    metric(lines, "pubsub_dropped", "gauge", "Events dropped across connected subscribers.", [
+        ("", sum(s["dropped"] for s in subscribers))
+    ])
+    return lines
+
+async def authorize_scrape(
+    token: str = Depends(oauth2_scheme),
+    db: AsyncSession = Depends(get_async_db),
+) -> None:
+    """Let in a scraper presenting METRICS_TOKEN, or an authenticated ADMIN."""
+    if settings.METRICS_TOKEN and hmac.compare_digest(token.encode(), settings.METRICS_TOKEN.encode()):
+        return
+    user = await get_current_user(token, db)
+    if user.role != RoleEnum.ADMIN:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Operation not permitted")
+
+@router.get(
+    "/metrics",
+    response_class=PlainTextResponse,
+    include_in_schema=False,
+    dependencies=[Depends(authorize_scrape)],
+)
+async def metrics():
+    """Prometheus text exposition of this process's metrics."""
+    lines = render_histograms()
+    lines += pool_lines()
+    lines += job_lines()
+    lines += pubsub_lines()
+    metric(lines, "password_hash_pending", "gauge", "Password hash jobs running or queued.", [
+        ("", PasswordHasher.pending())
+    ])
+    return PlainTextResponse("\n".join(lines) + "\n", media_type="text/plain; version=0.0.4")
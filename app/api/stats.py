@@ -0,0 +1,79 @@
+from collections import Counter
+from datetime import datetime, timedelta
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.issue import get_issue_repo
+from app.crud.issue import AsyncIssueRepository
+from app.crud.stats import AsyncStatsRepository
+from app.dependencies.auth import get_async_db, require_role
+from app.models import daily_stats
+from app.models.user import RoleEnum
+from app.schemas.stats import IssueCountsRead, RollupGranularity, StatsDimension, StatsSeries
+
+router = APIRouter(prefix="/stats", tags=["stats"])
+
+def as_naive(moment: Optional[datetime]) -> Optional[datetime]:
+    """Snapshots are stamped with naive server-local time; convert aware input to match."""
+    if moment is None or moment.tzinfo is None:
+        return moment
+    return moment.astimezone().replace(tzinfo=None)
+
+def get_stats_repo(db: AsyncSession = Depends(get_async_db)) -> AsyncStatsRepository:
+    return AsyncStatsRepository(db)
+
+@router.get(
+    "/",
+    response_model=StatsSeries,
+    dependencies=[Depends(require_role(RoleEnum.MAINTAINER, RoleEnum.ADMIN))],
+)
+async def stats_series(
+    bucket: RollupGranularity = RollupGranularity.DAY,
+    dimension: StatsDimension = StatsDimension.STATUS,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    repo: AsyncStatsRepository = Depends(get_stats_repo),
+):
+    """
+    Issue counts over [start, end] (default: the last 7 days) per hour, day
+    or week, broken down by status or severity. Each point is the count as
+    of the latest snapshot taken in its bucket.
+    """
+    end = as_naive(end) or datetime.now()
+    start = as_naive(start) or end - timedelta(days=7)
+    if start > end:
+        raise HTTPException(status_code=400, detail="start must not be after end")
+    points = await repo.series(
+        daily_stats.RollupGranularity(bucket.value), dimension.value, start, end
+    )
+    return {
+        "bucket": bucket,
+        "dimension": dimension,
+        "start": start,
+        "end": end,
+        "points": points,
+    }
+
+@router.get(
+    "/current",
+    response_model=IssueCountsRead,
+    dependencies=[Depends(require_role(RoleEnum.MAINTAINER, RoleEnum.ADMIN))],
+)
+async def current_counts(repo: AsyncIssueRepository = Depends(get_issue_repo)):
+    """
+    Real-time issue counts by status and severity, read from the
+    incrementally maintained counters.
+    """
+    cells = await repo.counts()
+    by_status, by_severity = Counter(), Counter()
+    for cell in cells:
+        by_status[cell.status] += cell.count
+        by_severity[cell.severity] += cell.count
+    return {
+        "total": sum(by_status.values()),
+        "by_status": by_status,
+        "by_severity": by_severity,
+        "cells": cells,
+    }
@@ -11,7 +11,7 @@ router = APIRouter()
     response_model=UserRead,
     dependencies=[Depends(require_role(RoleEnum.ADMIN))]
 )
-def set_user_role(
+async def set_user_role(
     user_id: int,
     new_role: RoleEnum,
     service: UserService = Depends()
@@ -19,4 +19,4 @@ def set_user_role(
     """
     ADMINs only: promote/demote any user to REPORTER, MAINTAINER, or ADMIN.
     """
-    return service.change_role(user_id, new_role)
+    return await service.change_role(user_id, new_role)
@@ -0,0 +1,152 @@
+"""
+Operational commands, kept out of the request path:
+
+    python -m app.cli bootstrap          create or upgrade the schema and the admin user
+    python -m app.cli profile-startup    report what importing the app costs
+"""
+import argparse
+import os
+import subprocess
+import sys
+
+from app.core.config import settings
+
+
+def upgrade_tables(connection, metadata) -> list[str]:
+    """
+    Bring tables that already exist up to the models: add missing columns
+    (with their foreign keys where the database can add them) and missing
+    indexes. Columns are only ever added, never altered or dropped, so new
+    model columns must be nullable or have a server default. Returns what
+    was changed.
+    """
+    from sqlalchemy import ForeignKeyConstraint, inspect
+    from sqlalchemy.schema import AddConstraint, CreateColumn
+
+    changes = []
+    inspector = inspect(connection)
+    existing_tables = set(inspector.get_table_names())
+    for table in metadata.sorted_tables:
+        if table.name not in existing_tables:
+            continue
+        present = {column["name"] for column in inspector.get_columns(table.name)}
+        for column in table.columns:
+            if column.name in present:
+                continue
+            ddl = CreateColumn(column).compile(dialect=connection.dialect)
+            connection.exec_driver_sql(f"ALTER TABLE {table.name} ADD COLUMN {ddl}")
+            changes.append(f"added column {table.name}.{column.name}")
+            # SQLite cannot add constraints to an existing table.
+            if connection.dialect.name != "sqlite":
+                for fk in column.foreign_keys:
+                    connection.execute(AddConstraint(ForeignKeyConstraint([column.name], [fk.target_fullname])))
+        indexes = {index["name"] for index in inspector.get_indexes(table.name)}
+        missing = [index for index in table.indexes if index.name not in indexes]
+        for index in missing:
+            # A no-op for indexes restricted to another dialect with ddl_if().
+            index.create(connection)
+        if missing:
+            created = {index["name"] for index in inspect(connection).get_indexes(table.name)} - indexes
+            changes.extend(f"added index {name}" for name in sorted(created))
+    return changes
+
+
+def create_schema() -> list[str]:
+    """
+    Create missing tables, upgrade existing ones created by an earlier
+    version (see upgrade_tables) and ensure SQLite's search index. Returns
+    the changes made to existing tables.
+    """
+    from app.database.base_class import Base
+    from app.database.session import get_engine
+    # Every model module must be imported for its table to be registered.
+    from app.models import (  # noqa: F401
+        attachment, daily_stats, idempotency, issue_counts, issues, rate_limit, scheduler_lease, user,
+    )
+    with get_engine().begin() as connection:
+        changes = upgrade_tables(connection, Base.metadata)
+        Base.metadata.create_all(bind=connection)
+        # create_all skips existing tables, so also add the search index to an
+        # issues table created before it existed.
+        issues.ensure_sqlite_search_index(connection)
+    return changes
+
+
+def ensure_admin() -> bool:
+    """Create the ADMIN_EMAIL account if it does not exist; True if it was created."""
+    from app.crud.user import UserRepository
+    from app.database.session import SessionLocal
+    from app.models.user import RoleEnum
+    from app.schemas.user import UserCreate
+
+    db = SessionLocal()
+    try:
+        repo = UserRepository(db)
+        if repo.get_by_email(settings.ADMIN_EMAIL):
+            return False
+        repo.create(UserCreate(email=settings.ADMIN_EMAIL, password=settings.ADMIN_PASSWORD), role=RoleEnum.ADMIN)
+        return True
+    finally:
+        db.close()
+
+
+def bootstrap(args) -> None:
+    for change in create_schema():
+        print(f"schema: {change}")
+    print("schema: up to date")
+    print(f"admin {settings.ADMIN_EMAIL}: {'created' if ensure_admin() else 'exists'}")
+
+
+IMPORT_TIMER = """
+import importlib, time
+started = time.perf_counter()
+importlib.import_module("app.main")
+print((time.perf_counter() - started) * 1000)
+"""
+
+
+def profile_startup(args) -> None:
+    """
+    Import the app in a fresh interpreter under -X importtime, report the
+    wall time of the import and list the modules with the largest
+    cumulative import time.
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", IMPORT_TIMER],
+        capture_output=True,
+        text=True,
+        cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    )
+    if result.returncode != 0:
+        sys.stderr.write(result.stderr)
+        sys.exit(result.returncode)
+
+    # Lines look like "import time:   self_us |   cumulative_us |   module".
+    modules = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        own, cumulative, name = line.removeprefix("import time:").split("|")
+        modules.append((int(cumulative), int(own), name))
+
+    # importlib bypasses the C import path, so app.main itself has no
+    # importtime line; its wall time comes from the timer on stdout.
+    print(f"import app.main: {float(result.stdout.split()[-1]):.1f} ms")
+    print(f"{'cumulative ms':>14} {'self ms':>9}  module")
+    for cumulative, own, name in sorted(modules, reverse=True)[:args.top]:
+        print(f"{cumulative / 1000:14.1f} {own / 1000:9.1f}  {name.strip()}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m app.cli")
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser("bootstrap", help="create missing tables and the admin user").set_defaults(func=bootstrap)
+    profile = commands.add_parser("profile-startup", help="report import-time cost of app.main")
+    profile.add_argument("--top", type=int, default=25)
+    profile.set_defaults(func=profile_startup)
+    args = parser.parse_args(argv)
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,3 +1,5 @@
+from typing import Literal, Optional
+
 from pydantic_settings import BaseSettings
 
 class Settings(BaseSettings):
@@ -8,6 +10,84 @@ class Settings(BaseSettings):
     ADMIN_EMAIL: str
     ADMIN_PASSWORD: str
 
+    # Connection pool tuning; ignored for SQLite, which uses its default pools.
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: float = 30.0
+    DB_POOL_RECYCLE: int = 1800
+    DB_POOL_PRE_PING: bool = True
+
+    BCRYPT_ROUNDS: int = 12
+    PASSWORD_HASH_WORKERS: int = 4
+    PASSWORD_HASH_QUEUE_DEPTH: int = 32
+
+    PRINCIPAL_CACHE_TTL_SECONDS: float = 30.0
+    PRINCIPAL_CACHE_SIZE: int = 10000
+    TOKEN_CACHE_SIZE: int = 10000
+
+    PUBSUB_QUEUE_SIZE: int = 256
+    # "coalesce" merges queued events of the same type for the same issue; a
+    # subscriber whose buffer holds only issue_created/issue_deleted is disconnected.
+    PUBSUB_OVERFLOW_POLICY: Literal["drop_oldest", "coalesce", "disconnect"] = "drop_oldest"
+    # "postgres" relays events between workers with LISTEN/NOTIFY.
+    PUBSUB_BROKER: Literal["memory", "postgres"] = "memory"
+    PUBSUB_CHANNEL: str = "issue_events"
+
+    SSE_REPLAY_BUFFER_SIZE: int = 1000
+    SSE_HEARTBEAT_SECONDS: float = 15.0
+
+    MAX_UPLOAD_BYTES: int = 100 * 1024 * 1024
+    # Multipart bodies may exceed MAX_UPLOAD_BYTES by this much (other form
+    # fields, part headers) before they are refused while still being received.
+    MAX_UPLOAD_FORM_OVERHEAD_BYTES: int = 1024 * 1024
+    # When set (e.g. "/protected-uploads"), downloads are handed to the
+    # reverse proxy via X-Accel-Redirect so it can sendfile() them.
+    ATTACHMENT_ACCEL_REDIRECT_PREFIX: Optional[str] = None
+
+    # In-process cache of serialized issue responses, keyed by ETag.
+    ISSUE_RESPONSE_CACHE_ENABLED: bool = False
+    ISSUE_RESPONSE_CACHE_SIZE: int = 1000
+    ISSUE_RESPONSE_CACHE_TTL_SECONDS: float = 300.0
+
+    # Raw snapshots and hourly rollups are pruned after these many days;
+    # daily and weekly rollups are kept.
+    STATS_RAW_RETENTION_DAYS: int = 30
+    STATS_HOURLY_RETENTION_DAYS: int = 90
+    STATS_CACHE_TTL_SECONDS: float = 60.0
+
+    STATS_AGGREGATION_INTERVAL_MINUTES: int = 30
+    COUNTER_RECONCILE_INTERVAL_MINUTES: int = 360
+
+    # Bearer token a Prometheus scraper presents to GET /metrics; without
+    # it the endpoint is open to ADMIN users only.
+    METRICS_TOKEN: Optional[str] = None
+
+    # Adds a Server-Timing header with the per-request SQL/auth/pubsub breakdown.
+    SERVER_TIMING_ENABLED: bool = False
+
+    # Token buckets: a sustained rate per minute plus a burst allowance.
+    # "database" shares buckets between workers via rate_limit_buckets.
+    RATE_LIMIT_ENABLED: bool = True
+    RATE_LIMIT_STORE: Literal["memory", "database"] = "memory"
+    RATE_LIMIT_MAX_KEYS: int = 100000
+    LOGIN_IP_PER_MINUTE: float = 30
+    LOGIN_IP_BURST: int = 10
+    LOGIN_ACCOUNT_PER_MINUTE: float = 5
+    LOGIN_ACCOUNT_BURST: int = 5
+    REGISTER_IP_PER_MINUTE: float = 5
+    REGISTER_IP_BURST: int = 5
+    # Issue writes per minute by role; a role missing here is unlimited.
+    ISSUE_WRITE_QUOTAS: dict[str, float] = {"REPORTER": 30, "MAINTAINER": 120, "ADMIN": 600}
+    ISSUE_WRITE_BURST: int = 20
+
+    # Stored responses for Idempotency-Key retries live this long; a
+    # placeholder whose request never finished is reclaimed after the timeout.
+    IDEMPOTENCY_KEY_TTL_HOURS: int = 24
+    IDEMPOTENCY_PENDING_TIMEOUT_SECONDS: int = 300
+
+    BULK_CHUNK_SIZE: int = 1000
+    EXPORT_CHUNK_SIZE: int = 1000
+
     class Config:
         env_file = ".env"
         env_file_encoding = 'utf-8'
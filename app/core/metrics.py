@@ -0,0 +1,169 @@
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Optional
+
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100, 250)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(names: tuple[str, ...], values: tuple, extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(str(value))}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+class Histogram:
+    """A Prometheus-style histogram with a fixed label set."""
+    registry: list["Histogram"] = []
+
+    def __init__(self, name: str, help: str, labels: tuple[str, ...] = (), buckets: tuple = LATENCY_BUCKETS):
+        self.name = name
+        self.help = help
+        self.labels = labels
+        self.buckets = buckets
+        self._series: dict[tuple, list] = {}
+        self._lock = threading.Lock()
+        Histogram.registry.append(self)
+
+    def observe(self, value: float, *label_values) -> None:
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(label_values)
+            if series is None:
+                series = self._series[label_values] = [[0] * len(self.buckets), 0.0, 0]
+            if index < len(self.buckets):
+                series[0][index] += 1
+            series[1] += value
+            series[2] += 1
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            series = {key: (list(counts), total, n) for key, (counts, total, n) in self._series.items()}
+        for label_values, (counts, total, n) in sorted(series.items()):
+            cumulative = 0
+            for bound, count in zip(self.buckets, counts):
+                cumulative += count
+                le = _labels(self.labels, label_values, 'le="%s"' % bound)
+                lines.append(f"{self.name}_bucket{le} {cumulative}")
+            le = _labels(self.labels, label_values, 'le="+Inf"')
+            lines.append(f"{self.name}_bucket{le} {n}")
+            lines.append(f"{self.name}_sum{_labels(self.labels, label_values)} {total}")
+            lines.append(f"{self.name}_count{_labels(self.labels, label_values)} {n}")
+        return lines
+
+
+REQUEST_SECONDS = Histogram(
+    "http_request_duration_seconds", "Request latency by route.", ("method", "route", "status")
+)
+REQUEST_SQL_QUERIES = Histogram(
+    "http_request_sql_queries", "SQL statements executed per request.", ("route",), COUNT_BUCKETS
+)
+REQUEST_SQL_SECONDS = Histogram(
+    "http_request_sql_seconds", "Time spent in SQL per request.", ("route",)
+)
+OPERATION_SECONDS = Histogram(
+    "app_operation_duration_seconds", "Latency of instrumented operations.", ("operation",)
+)
+
+
+class RequestTimings:
+    """Per-request totals (count, seconds) of each instrumented operation."""
+    def __init__(self):
+        self.spans: dict[str, list] = {}
+
+    def add(self, operation: str, seconds: float) -> None:
+        span = self.spans.setdefault(operation, [0, 0.0])
+        span[0] += 1
+        span[1] += seconds
+
+    def count(self, operation: str) -> int:
+        return self.spans.get(operation, (0, 0.0))[0]
+
+    def seconds(self, operation: str) -> float:
+        return self.spans.get(operation, (0, 0.0))[1]
+
+    def server_timing(self, total: float) -> str:
+        entries = [
+            f'{operation};dur={seconds * 1000:.2f};desc="{count}x"'
+            for operation, (count, seconds) in self.spans.items()
+        ]
+        entries.append(f"total;dur={total * 1000:.2f}")
+        return ", ".join(entries)
+
+
+current_timings: ContextVar[Optional[RequestTimings]] = ContextVar("request_timings", default=None)
+
+
+def record(operation: str, seconds: float) -> None:
+    """Count `seconds` of `operation` globally and against the current request, if any."""
+    OPERATION_SECONDS.observe(seconds, operation)
+    timings = current_timings.get()
+    if timings is not None:
+        timings.add(operation, seconds)
+
+
+@contextmanager
+def timed(operation: str):
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        record(operation, time.perf_counter() - start)
+
+
+class InstrumentationMiddleware:
+    """
+    Pure ASGI middleware timing each HTTP request by route template, with
+    the SQL it ran. Optionally reports the per-request breakdown in a
+    Server-Timing header.
+    """
+    def __init__(self, app, server_timing: bool = False):
+        self.app = app
+        self.server_timing = server_timing
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        timings = RequestTimings()
+        token = current_timings.set(timings)
+        start = time.perf_counter()
+        status_code = 500
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                if self.server_timing:
+                    header = timings.server_timing(time.perf_counter() - start)
+                    message = {**message, "headers": [*message.get("headers", ()), (b"server-timing", header.encode())]}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - start
+            # The router records the matched route in the scope; label by its
+            # template so ids in paths do not explode the series count.
+            route = getattr(scope.get("route"), "path", "unmatched")
+            REQUEST_SECONDS.observe(elapsed, scope["method"], route, str(status_code))
+            REQUEST_SQL_QUERIES.observe(timings.count("sql"), route)
+            REQUEST_SQL_SECONDS.observe(timings.seconds("sql"), route)
+            current_timings.reset(token)
+
+
+def render_histograms() -> list[str]:
+    lines = []
+    for histogram in Histogram.registry:
+        lines.extend(histogram.render())
+    return lines
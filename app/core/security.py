@@ -1,22 +1,99 @@
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 from typing import Optional
 from jose import JWTError, jwt
 from passlib.context import CryptContext
 from app.core.config import settings
+from app.core.metrics import timed
+
+class HasherBusy(Exception):
+    """Raised when the password hashing pool has no free worker or queue slot."""
 
 class PasswordHasher:
     """Encapsulates password hashing and verification."""
-    _pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+    # Built on first use: constructing the context and the pool is not
+    # free, and most imports of this module never hash anything.
+    _pwd_context: Optional[CryptContext] = None
+    _executor: Optional[ThreadPoolExecutor] = None
+    _capacity = settings.PASSWORD_HASH_WORKERS + settings.PASSWORD_HASH_QUEUE_DEPTH
+    _pending = 0
+    _lock = threading.Lock()
+
+    @classmethod
+    def _context(cls) -> CryptContext:
+        if cls._pwd_context is None:
+            with cls._lock:
+                if cls._pwd_context is None:
+                    cls._pwd_context = CryptContext(
+                        schemes=["bcrypt"],
+                        deprecated="auto",
+                        bcrypt__default_rounds=settings.BCRYPT_ROUNDS,
+                        bcrypt__min_rounds=settings.BCRYPT_ROUNDS,
+                    )
+        return cls._pwd_context
+
+    @classmethod
+    def _pool(cls) -> ThreadPoolExecutor:
+        if cls._executor is None:
+            with cls._lock:
+                if cls._executor is None:
+                    # bcrypt releases the GIL, so a thread pool gives real parallelism.
+                    cls._executor = ThreadPoolExecutor(
+                        max_workers=settings.PASSWORD_HASH_WORKERS,
+                        thread_name_prefix="bcrypt",
+                    )
+        return cls._executor
 
     @classmethod
     def hash(cls, password: str) -> str:
         """Generate bcrypt hash for a password."""
-        return cls._pwd_context.hash(password)
+        return cls._context().hash(password)
 
     @classmethod
     def verify(cls, plain_password: str, hashed_password: str) -> bool:
         """Verify a plaintext password against its hash."""
-        return cls._pwd_context.verify(plain_password, hashed_password)
+        return cls._context().verify(plain_password, hashed_password)
+
+    @classmethod
+    def verify_and_update(cls, plain_password: str, hashed_password: str) -> tuple[bool, Optional[str]]:
+        """
+        Verify a password and, if its hash is outdated (e.g. a lower cost
+        factor than BCRYPT_ROUNDS), return a fresh hash to store.
+        """
+        return cls._context().verify_and_update(plain_password, hashed_password)
+
+    @classmethod
+    async def _submit(cls, operation: str, fn, *args):
+        with cls._lock:
+            if cls._pending >= cls._capacity:
+                raise HasherBusy()
+            cls._pending += 1
+        try:
+            loop = asyncio.get_running_loop()
+            # Timed here rather than in the worker, so queueing counts too and
+            # the request's context is still current.
+            with timed(operation):
+                return await loop.run_in_executor(cls._pool(), fn, *args)
+        finally:
+            with cls._lock:
+                cls._pending -= 1
+
+    @classmethod
+    def pending(cls) -> int:
+        """Hash jobs running or queued right now."""
+        return cls._pending
+
+    @classmethod
+    async def hash_async(cls, password: str) -> str:
+        """hash() on the bounded worker pool; raises HasherBusy when saturated."""
+        return await cls._submit("password_hash", cls.hash, password)
+
+    @classmethod
+    async def verify_and_update_async(cls, plain_password: str, hashed_password: str) -> tuple[bool, Optional[str]]:
+        """verify_and_update() on the bounded worker pool; raises HasherBusy when saturated."""
+        return await cls._submit("password_verify", cls.verify_and_update, plain_password, hashed_password)
 
 class JWTAuth:
     """Encapsulates JWT token creation and decoding."""
@@ -33,4 +110,5 @@ class JWTAuth:
     @staticmethod
     def decode_token(token: str) -> dict:
         """Decode and verify a JWT token, raising JWTError on failure."""
-        return jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
\ No newline at end of file
+        with timed("token_decode"):
+            return jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
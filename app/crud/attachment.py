@@ -1,13 +1,103 @@
+from collections import Counter
+
+from sqlalchemy import delete, update
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from app.models.attachment import FileAttachment
+from app.crud.issue_version import bump_version
+from app.database.upsert import insert_for
+from app.models.attachment import AttachmentBlob, FileAttachment
+from app.utils.storage import StoredFile, attachment_store
+
+def acquire_blob(dialect: str, stored: StoredFile):
+    """Insert the blob row, or add a reference to it if it already exists; returns the new ref_count."""
+    stmt = insert_for(dialect)(AttachmentBlob).values(
+        sha256=stored.sha256, path=stored.path, size=stored.size, ref_count=1
+    )
+    return stmt.on_conflict_do_update(
+        index_elements=[AttachmentBlob.sha256],
+        set_={"ref_count": AttachmentBlob.ref_count + 1},
+    ).returning(AttachmentBlob.ref_count)
+
+def _attachment(issue_id: int, filename: str, stored: StoredFile) -> FileAttachment:
+    return FileAttachment(
+        issue_id=issue_id,
+        filename=filename,
+        filepath=stored.path,
+        content_hash=stored.sha256,
+        size=stored.size,
+    )
 
 class AttachmentRepository:
     def __init__(self, db: Session):
         self.db = db
 
-    def create_issue_with_attachment(self, issue_id: int, filename: str, filepath: str):
-        attachment = FileAttachment(issue_id=issue_id, filename=filename, filepath=filepath)
+    def create_issue_with_attachment(self, issue_id: int, filename: str, stored: StoredFile):
+        # The upsert locks the blob row; place the file before committing so
+        # a concurrent delete of the same content waits for us or finishes first.
+        stored.created = self.db.execute(acquire_blob(self.db.get_bind().dialect.name, stored)).scalar_one() == 1
+        attachment_store.place(stored)
+        attachment = _attachment(issue_id, filename, stored)
         self.db.add(attachment)
-        self.db.commit()
+        self.db.execute(bump_version(self.db.get_bind().dialect.name))
+        try:
+            self.db.commit()
+        except BaseException:
+            attachment_store.abandon(stored)
+            raise
         self.db.refresh(attachment)
         return attachment
+
+
+class AsyncAttachmentRepository:
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def create_issue_with_attachment(
+        self, issue_id: int, filename: str, stored: StoredFile, commit: bool = True
+    ):
+        # The upsert locks the blob row; place the file before committing so
+        # a concurrent delete of the same content waits for us or finishes first.
+        stored.created = (
+            await self.db.execute(acquire_blob(self.db.get_bind().dialect.name, stored))
+        ).scalar_one() == 1
+        attachment_store.place(stored)
+        attachment = _attachment(issue_id, filename, stored)
+        self.db.add(attachment)
+        if commit:
+            await self.db.execute(bump_version(self.db.get_bind().dialect.name))
+            try:
+                await self.db.commit()
+            except BaseException:
+                attachment_store.abandon(stored)
+                raise
+        else:
+            # The caller bumps the version last, then commits, and calls
+            # attachment_store.abandon(stored) if the transaction fails.
+            await self.db.flush()
+        await self.db.refresh(attachment)
+        return attachment
+
+    async def release(self, attachments: list[FileAttachment]) -> list[str]:
+        """
+        Drop one blob reference per attachment and delete blob rows nobody
+        references any more, returning their hashes. The deleted rows stay
+        locked until the caller commits, which is when their files may go.
+        """
+        counts = Counter(a.content_hash for a in attachments if a.content_hash)
+        orphaned = []
+        # Sorted so concurrent deletes lock shared blob rows in the same order.
+        for sha256, n in sorted(counts.items()):
+            remaining = await self.db.scalar(
+                update(AttachmentBlob)
+                .where(AttachmentBlob.sha256 == sha256)
+                .values(ref_count=AttachmentBlob.ref_count - n)
+                .returning(AttachmentBlob.ref_count)
+            )
+            if remaining is not None and remaining <= 0:
+                await self.db.execute(
+                    delete(AttachmentBlob).where(
+                        AttachmentBlob.sha256 == sha256, AttachmentBlob.ref_count <= 0
+                    )
+                )
+                orphaned.append(sha256)
+        return orphaned
@@ -0,0 +1,101 @@
+from datetime import datetime, timedelta
+
+from sqlalchemy import delete, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from app.core.config import settings
+from app.database.upsert import insert_for
+from app.models.idempotency import IdempotencyRecord
+
+
+class AsyncIdempotencyRepository:
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    def _dialect(self) -> str:
+        return self.db.get_bind().dialect.name
+
+    async def reserve(self, user_id: int, key: str, fingerprint: str) -> IdempotencyRecord | None:
+        """
+        Claim `key` for a new request by inserting a pending placeholder.
+        Returns None if the claim succeeded, otherwise the existing record.
+        Expired records, and placeholders left behind by a request that
+        never finished, are replaced.
+        """
+        for _ in range(2):
+            now = datetime.utcnow()
+            inserted = (await self.db.execute(
+                insert_for(self._dialect())(IdempotencyRecord)
+                .values(
+                    user_id=user_id,
+                    key=key,
+                    fingerprint=fingerprint,
+                    created_at=now,
+                    expires_at=now + timedelta(hours=settings.IDEMPOTENCY_KEY_TTL_HOURS),
+                )
+                .on_conflict_do_nothing(index_elements=[IdempotencyRecord.user_id, IdempotencyRecord.key])
+            )).rowcount
+            await self.db.commit()
+            if inserted:
+                return None
+
+            record = await self.db.get(IdempotencyRecord, (user_id, key), populate_existing=True)
+            if record is None:
+                continue
+            abandoned = (
+                record.status_code is None
+                and record.created_at < now - timedelta(seconds=settings.IDEMPOTENCY_PENDING_TIMEOUT_SECONDS)
+            )
+            if record.expires_at > now and not abandoned:
+                return record
+            # Only delete the row we looked at; a concurrent retry may have replaced it.
+            await self.db.execute(
+                delete(IdempotencyRecord).where(
+                    IdempotencyRecord.user_id == user_id,
+                    IdempotencyRecord.key == key,
+                    IdempotencyRecord.created_at == record.created_at,
+                )
+            )
+            await self.db.commit()
+        return await self.db.get(IdempotencyRecord, (user_id, key), populate_existing=True)
+
+    async def complete(
+        self, user_id: int, key: str, status_code: int, response: bytes, commit: bool = True
+    ) -> None:
+        """
+        Store the response for replay. Pass commit=False to commit it in the
+        same transaction as the work it describes.
+        """
+        await self.db.execute(
+            update(IdempotencyRecord)
+            .where(IdempotencyRecord.user_id == user_id, IdempotencyRecord.key == key)
+            .values(status_code=status_code, response=response.decode())
+        )
+        if commit:
+            await self.db.commit()
+
+    async def release(self, user_id: int, key: str) -> None:
+        """Drop a pending placeholder so the request can be retried from scratch."""
+        await self.db.rollback()
+        await self.db.execute(
+            delete(IdempotencyRecord).where(
+                IdempotencyRecord.user_id == user_id,
+                IdempotencyRecord.key == key,
+                IdempotencyRecord.status_code.is_(None),
+            )
+        )
+        await self.db.commit()
+
+
+def purge_expired_keys() -> int:
+    """Delete expired idempotency records; run periodically by the scheduler."""
+    from app.database.session import SessionLocal
+    db: Session = SessionLocal()
+    try:
+        deleted = db.execute(
+            delete(IdempotencyRecord).where(IdempotencyRecord.expires_at <= datetime.utcnow())
+        ).rowcount
+        db.commit()
+        return deleted
+    finally:
+        db.close()
@@ -1,14 +1,95 @@
+from collections import Counter
+from collections.abc import AsyncIterator
+from datetime import datetime
+from sqlalchemy import Row, Select, insert, select, tuple_, update
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from app.models.issues import Issue, StatusEnum
-from app.schemas.issues import IssueCreate
+from app.crud.attachment import AsyncAttachmentRepository
+from app.crud.issue_version import bump_version
+from app.database.upsert import insert_for
+from app.models.issue_counts import IssueCount
+from app.models.issues import Issue, SeverityEnum, StatusEnum
+from app.schemas.issues import IssueCreate, IssueImport
+from app.utils.storage import attachment_store
+
+
+def apply_filters(
+    query: Select,
+    status: StatusEnum | None = None,
+    severity: SeverityEnum | None = None,
+    reporter_id: int | None = None,
+) -> Select:
+    """Restrict an issues query by the optional list/export filters."""
+    if status is not None:
+        query = query.where(Issue.status == status)
+    if severity is not None:
+        query = query.where(Issue.severity == severity)
+    if reporter_id is not None:
+        query = query.where(Issue.reporter_id == reporter_id)
+    return query
+
+
+def page_query(
+    limit: int,
+    cursor: tuple[datetime, int] | None = None,
+    **filters,
+) -> Select:
+    """
+    Select up to `limit` issues, newest first, strictly after the
+    (created_at, id) keyset position given by `cursor`.
+    """
+    query = apply_filters(select(Issue), **filters)
+    if cursor is not None:
+        query = query.where(tuple_(Issue.created_at, Issue.id) < tuple_(*cursor))
+    return query.order_by(Issue.created_at.desc(), Issue.id.desc()).limit(limit)
+
+
+EXPORT_COLUMNS = (
+    Issue.id,
+    Issue.title,
+    Issue.description,
+    Issue.severity,
+    Issue.status,
+    Issue.reporter_id,
+    Issue.created_at,
+    Issue.updated_at,
+)
+
+
+def count_delta(dialect: str, status: StatusEnum, severity: SeverityEnum, delta: int):
+    """Upsert adding `delta` to the live counter for (status, severity)."""
+    stmt = insert_for(dialect)(IssueCount).values(status=status, severity=severity, count=delta)
+    return stmt.on_conflict_do_update(
+        index_elements=[IssueCount.status, IssueCount.severity],
+        set_={"count": IssueCount.count + delta},
+    )
+
+
+def cell_order(cell: tuple) -> tuple[str, str]:
+    """Canonical order for locking (status, severity) counter cells."""
+    return cell[0].value, cell[1].value
+
+
+def count_moves(before: tuple, after: tuple) -> list[tuple]:
+    """Counter adjustments for an issue moving between (status, severity) cells, in lock order."""
+    if before == after:
+        return []
+    return sorted([(*before, -1), (*after, 1)], key=cell_order)
+
 
 class IssueRepository:
     def __init__(self, db: Session):
         self.db = db
 
+    def _dialect(self) -> str:
+        return self.db.get_bind().dialect.name
+
     def create(self, issue_in: IssueCreate, reporter_id: int) -> Issue:
         issue = Issue(**issue_in.model_dump(), reporter_id=reporter_id)
         self.db.add(issue)
+        self.db.flush()
+        self.db.execute(count_delta(self._dialect(), issue.status, issue.severity, 1))
+        self.db.execute(bump_version(self._dialect()))
         self.db.commit()
         self.db.refresh(issue)
         return issue
@@ -16,19 +97,187 @@ class IssueRepository:
     def get(self, issue_id: int) -> Issue | None:
         return self.db.query(Issue).filter(Issue.id == issue_id).first()
 
-    def list_all(self) -> list[Issue]:
-        return self.db.query(Issue).order_by(Issue.created_at.desc()).all()
-
-    def list_by_reporter(self, reporter_id: int) -> list[Issue]:
-        return (
-            self.db.query(Issue)
-            .filter(Issue.reporter_id == reporter_id)
-            .order_by(Issue.created_at.desc())
-            .all()
-        )
+    def list_page(self, limit: int, **filters) -> list[Issue]:
+        return list(self.db.scalars(page_query(limit, **filters)))
 
     def update_status(self, issue: Issue, new_status: StatusEnum) -> Issue:
+        moves = count_moves((issue.status, issue.severity), (new_status, issue.severity))
         issue.status = new_status
+        for status, severity, delta in moves:
+            self.db.execute(count_delta(self._dialect(), status, severity, delta))
+        self.db.execute(bump_version(self._dialect()))
         self.db.commit()
         self.db.refresh(issue)
         return issue
+
+
+class AsyncIssueRepository:
+    """Async counterpart of IssueRepository for use on the event loop."""
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    def _dialect(self) -> str:
+        return self.db.get_bind().dialect.name
+
+    async def commit(self) -> None:
+        """
+        Bump the collection version and commit. Every write path locks rows
+        in the same order (counter cells, then blobs, then the version row,
+        always last), so concurrent writers queue instead of deadlocking.
+        """
+        await self.db.execute(bump_version(self._dialect()))
+        await self.db.commit()
+
+    async def _adjust_counts(self, deltas: Counter) -> None:
+        # Sorted so two transactions never lock the same cells in opposite orders.
+        for cell in sorted(deltas, key=cell_order):
+            if deltas[cell]:
+                await self.db.execute(count_delta(self._dialect(), *cell, deltas[cell]))
+
+    async def _move(self, before: tuple, after: tuple) -> None:
+        for status, severity, delta in count_moves(before, after):
+            await self.db.execute(count_delta(self._dialect(), status, severity, delta))
+
+    async def create(self, issue_in: IssueCreate, reporter_id: int, commit: bool = True) -> Issue:
+        """Insert an issue; with commit=False the caller finishes with commit()."""
+        issue = Issue(**issue_in.model_dump(), reporter_id=reporter_id)
+        self.db.add(issue)
+        await self.db.flush()
+        await self.db.execute(count_delta(self._dialect(), issue.status, issue.severity, 1))
+        if commit:
+            await self.commit()
+        await self.db.refresh(issue)
+        return issue
+
+    async def get(self, issue_id: int) -> Issue | None:
+        return await self.db.scalar(select(Issue).where(Issue.id == issue_id))
+
+    async def list_page(self, limit: int, **filters) -> list[Issue]:
+        return list(await self.db.scalars(page_query(limit, **filters)))
+
+    async def update_status(self, issue: Issue, new_status: StatusEnum) -> Issue:
+        await self._move((issue.status, issue.severity), (new_status, issue.severity))
+        issue.status = new_status
+        await self.commit()
+        await self.db.refresh(issue)
+        return issue
+
+    async def update_details(self, issue: Issue, issue_in: IssueCreate) -> Issue:
+        await self._move((issue.status, issue.severity), (issue.status, issue_in.severity))
+        issue.title = issue_in.title
+        issue.description = issue_in.description
+        issue.severity = issue_in.severity
+        await self.commit()
+        await self.db.refresh(issue)
+        return issue
+
+    async def delete(self, issue: Issue) -> None:
+        """
+        Delete an issue and release its attachments' blobs in one transaction,
+        removing the files of blobs that are now unreferenced.
+        """
+        attachments = list(issue.attachments)
+        await self.db.execute(count_delta(self._dialect(), issue.status, issue.severity, -1))
+        await self.db.delete(issue)
+        await self.db.flush()
+        orphaned = await AsyncAttachmentRepository(self.db).release(attachments)
+        # Move the files aside while the deleted blob rows are still locked: an
+        # upload of the same content blocks on them and writes a fresh copy
+        # after we commit. Put them back if the commit fails.
+        trashed = {sha256: attachment_store.trash(sha256) for sha256 in orphaned}
+        try:
+            await self.commit()
+        except BaseException:
+            for sha256, path in trashed.items():
+                attachment_store.restore(sha256, path)
+            raise
+        for path in trashed.values():
+            attachment_store.purge(path)
+
+    async def bulk_create(self, items: list[IssueImport], reporter_id: int) -> int:
+        """Insert a batch of issues with one executemany in one transaction."""
+        now = datetime.now()
+        rows = [
+            {
+                "title": item.title,
+                "description": item.description,
+                "severity": item.severity,
+                "status": item.status,
+                "reporter_id": item.reporter_id or reporter_id,
+                "created_at": item.created_at or now,
+                "updated_at": now,
+            }
+            for item in items
+        ]
+        await self.db.execute(insert(Issue), rows)
+        await self._adjust_counts(Counter((row["status"], row["severity"]) for row in rows))
+        await self.commit()
+        return len(rows)
+
+    async def _update_status_chunk(self, ids: list[int], new_status: StatusEnum) -> int:
+        rows = (await self.db.execute(
+            select(Issue.id, Issue.status, Issue.severity)
+            .where(Issue.id.in_(ids), Issue.status != new_status)
+            .with_for_update()
+        )).all()
+        if rows:
+            await self.db.execute(
+                update(Issue)
+                .where(Issue.id.in_([row.id for row in rows]))
+                .values(status=new_status, updated_at=datetime.now()),
+                execution_options={"synchronize_session": False},
+            )
+            moves = Counter()
+            for row in rows:
+                for status, severity, delta in count_moves((row.status, row.severity), (new_status, row.severity)):
+                    moves[(status, severity)] += delta
+            await self._adjust_counts(moves)
+            await self.commit()
+        else:
+            await self.db.commit()
+        return len(rows)
+
+    async def bulk_update_status(
+        self,
+        new_status: StatusEnum,
+        chunk_size: int,
+        ids: list[int] | None = None,
+        **filters,
+    ) -> int:
+        """
+        Move every issue in `ids`, or matching `filters`, to `new_status`,
+        committing every `chunk_size` issues. Returns how many changed.
+        """
+        updated = 0
+        if ids is not None:
+            for start in range(0, len(ids), chunk_size):
+                updated += await self._update_status_chunk(ids[start:start + chunk_size], new_status)
+            return updated
+
+        query = apply_filters(select(Issue.id).where(Issue.status != new_status), **filters)
+        last_id = 0
+        while True:
+            chunk = list(await self.db.scalars(
+                query.where(Issue.id > last_id).order_by(Issue.id).limit(chunk_size)
+            ))
+            if not chunk:
+                return updated
+            updated += await self._update_status_chunk(chunk, new_status)
+            last_id = chunk[-1]
+
+    async def stream_rows(self, chunk_size: int, **filters) -> AsyncIterator[list[Row]]:
+        """
+        Yield flat issue rows (EXPORT_COLUMNS) in id order, `chunk_size` at a
+        time, from a server-side cursor so memory stays bounded.
+        """
+        result = await self.db.stream(
+            apply_filters(select(*EXPORT_COLUMNS), **filters)
+            .order_by(Issue.id)
+            .execution_options(yield_per=chunk_size)
+        )
+        async for partition in result.partitions():
+            yield partition
+
+    async def counts(self) -> list[IssueCount]:
+        """Live per-(status, severity) issue counts; a read of at most a dozen rows."""
+        return list(await self.db.scalars(select(IssueCount).where(IssueCount.count != 0)))
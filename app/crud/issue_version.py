@@ -0,0 +1,17 @@
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.database.upsert import insert_for
+from app.models.issue_counts import IssueCollectionVersion
+
+
+def bump_version(dialect: str):
+    """Upsert adding one to the issue collection version; run it inside the write's transaction."""
+    stmt = insert_for(dialect)(IssueCollectionVersion).values(id=1, version=1)
+    return stmt.on_conflict_do_update(
+        index_elements=[IssueCollectionVersion.id],
+        set_={"version": IssueCollectionVersion.version + 1},
+    )
+
+
+async def current_version(db: AsyncSession) -> int:
+    return await db.scalar(select(IssueCollectionVersion.version).where(IssueCollectionVersion.id == 1)) or 0
@@ -0,0 +1,93 @@
+import html
+from dataclasses import dataclass
+
+from sqlalchemy import func, literal_column, select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.issues import Issue, search_document
+
+# The database marks matches with these private-use characters; the text
+# is HTML-escaped before they become <mark> tags, so highlights are safe to
+# render as HTML.
+HIGHLIGHT_START = "\ue000"
+HIGHLIGHT_STOP = "\ue001"
+
+def render_highlight(text: str | None) -> str:
+    escaped = html.escape(text or "", quote=True)
+    return escaped.replace(HIGHLIGHT_START, "<mark>").replace(HIGHLIGHT_STOP, "</mark>")
+
+@dataclass
+class SearchHit:
+    issue: Issue
+    rank: float
+    title_highlight: str
+    description_highlight: str
+
+def fts5_query(q: str) -> str:
+    """Quote each term so user input is matched literally, never parsed as FTS5 syntax."""
+    return " ".join('"' + term.replace('"', '""') + '"' for term in q.split())
+
+class AsyncSearchRepository:
+    """Ranked full-text search over issue titles and descriptions."""
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def search(self, q: str, limit: int, offset: int = 0, reporter_id: int | None = None) -> list[SearchHit]:
+        if not q.strip():
+            return []
+        if self.db.get_bind().dialect.name == "postgresql":
+            matches = await self._postgres(q, limit, offset, reporter_id)
+        else:
+            matches = await self._sqlite(q, limit, offset, reporter_id)
+        if not matches:
+            return []
+
+        issues = {
+            issue.id: issue
+            for issue in await self.db.scalars(select(Issue).where(Issue.id.in_([m[0] for m in matches])))
+        }
+        return [
+            SearchHit(issues[issue_id], rank, render_highlight(title), render_highlight(description))
+            for issue_id, rank, title, description in matches
+            if issue_id in issues
+        ]
+
+    async def _postgres(self, q, limit, offset, reporter_id) -> list[tuple]:
+        query = func.websearch_to_tsquery(literal_column("'english'"), q)
+        document = search_document()
+        ranked = select(Issue.id, func.ts_rank(document, query).label("rank")).where(document.op("@@")(query))
+        if reporter_id is not None:
+            ranked = ranked.where(Issue.reporter_id == reporter_id)
+        page = ranked.order_by(literal_column("rank").desc(), Issue.id.desc()).limit(limit).offset(offset).subquery()
+
+        # Headlines are costly, so only compute them for the page being returned.
+        options = f"StartSel={HIGHLIGHT_START}, StopSel={HIGHLIGHT_STOP}"
+        rows = await self.db.execute(
+            select(
+                page.c.id,
+                page.c.rank,
+                func.ts_headline(literal_column("'english'"), Issue.title, query, options + ", HighlightAll=true"),
+                func.ts_headline(literal_column("'english'"), Issue.description, query, options + ", MaxFragments=2"),
+            )
+            .join(Issue, Issue.id == page.c.id)
+            .order_by(page.c.rank.desc(), page.c.id.desc())
+        )
+        return [tuple(row) for row in rows]
+
+    async def _sqlite(self, q, limit, offset, reporter_id) -> list[tuple]:
+        sql = (
+            "SELECT rowid, -bm25(issues_fts) AS rank, "
+            "highlight(issues_fts, 0, :start, :stop), "
+            "snippet(issues_fts, 1, :start, :stop, '…', 24) "
+            "FROM issues_fts WHERE issues_fts MATCH :q "
+        )
+        params = {
+            "q": fts5_query(q), "start": HIGHLIGHT_START, "stop": HIGHLIGHT_STOP,
+            "limit": limit, "offset": offset,
+        }
+        if reporter_id is not None:
+            sql += "AND rowid IN (SELECT id FROM issues WHERE reporter_id = :reporter_id) "
+            params["reporter_id"] = reporter_id
+        sql += "ORDER BY bm25(issues_fts), rowid DESC LIMIT :limit OFFSET :offset"
+        rows = await self.db.execute(text(sql), params)
+        return [tuple(row) for row in rows]
@@ -0,0 +1,55 @@
+from datetime import datetime, timedelta
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.models.daily_stats import RollupGranularity, StatsRollup
+
+# Query results keyed by their parameters; cleared whenever a snapshot lands.
+stats_cache = TTLCache(maxsize=1024, ttl=settings.STATS_CACHE_TTL_SECONDS)
+
+def bucket_floor(moment: datetime, granularity: RollupGranularity) -> datetime:
+    """Start of the hour, day or (Monday-based) week containing `moment`."""
+    start = moment.replace(minute=0, second=0, microsecond=0)
+    if granularity is RollupGranularity.HOUR:
+        return start
+    start = start.replace(hour=0)
+    if granularity is RollupGranularity.DAY:
+        return start
+    return start - timedelta(days=start.weekday())
+
+class AsyncStatsRepository:
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def series(
+        self,
+        granularity: RollupGranularity,
+        dimension: str,
+        start: datetime,
+        end: datetime,
+    ) -> list[dict]:
+        """Rollup points for one dimension over [start, end], cached until the next snapshot."""
+        # Bucket starts are aligned, so flooring both ends selects the same
+        # rows and lets "now"-relative windows share a cache entry.
+        start = bucket_floor(start, granularity)
+        end = bucket_floor(end, granularity)
+        key = (granularity, dimension, start, end)
+        cached = stats_cache.get(key)
+        if cached is not None:
+            return cached
+        rows = await self.db.execute(
+            select(StatsRollup.bucket_start, StatsRollup.value, StatsRollup.count)
+            .where(
+                StatsRollup.granularity == granularity,
+                StatsRollup.dimension == dimension,
+                StatsRollup.bucket_start >= start,
+                StatsRollup.bucket_start <= end,
+            )
+            .order_by(StatsRollup.bucket_start, StatsRollup.value)
+        )
+        points = [row._asdict() for row in rows]
+        stats_cache.set(key, points)
+        return points
@@ -1,3 +1,5 @@
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from app.models.user import User, RoleEnum
 from app.schemas.user import UserCreate
@@ -26,4 +28,35 @@ class UserRepository:
         user.role = new_role
         self.db.commit()
         self.db.refresh(user)
-        return user    
\ No newline at end of file
+        return user
+
+
+class AsyncUserRepository:
+    """Async counterpart of UserRepository; hashing runs on PasswordHasher's pool."""
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def get_by_email(self, email: str) -> User | None:
+        return await self.db.scalar(select(User).where(User.email == email))
+
+    async def get(self, user_id: int) -> User | None:
+        return await self.db.scalar(select(User).where(User.id == user_id))
+
+    async def create(self, user_in: UserCreate, role: RoleEnum = RoleEnum.REPORTER) -> User:
+        hashed = await PasswordHasher.hash_async(user_in.password)
+        user = User(email=user_in.email, hashed_password=hashed, role=role)
+        self.db.add(user)
+        await self.db.commit()
+        await self.db.refresh(user)
+        return user
+
+    async def update_role(self, user: User, new_role: RoleEnum) -> User:
+        user.role = new_role
+        await self.db.commit()
+        await self.db.refresh(user)
+        return user
+
+    async def update_password_hash(self, user: User, hashed_password: str) -> User:
+        user.hashed_password = hashed_password
+        await self.db.commit()
+        return user
@@ -1,16 +1,90 @@
+import functools
+
 from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.engine import URL, Engine, make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
 from app.core.config import settings
-from app.database.base_class import Base
-
-engine = create_engine(
-    settings.SQLALCHEMY_DATABASE_URL,
-    pool_pre_ping=True,  
+from app.database.pool import (
+    PoolMetrics,
+    async_pool_metrics,
+    instrument_engine,
+    instrument_queries,
+    sync_pool_metrics,
+    timed_pool_class,
 )
 
-SessionLocal = sessionmaker(
-    autocommit=False,
-    autoflush=False,
-    bind=engine
-)
-Base.metadata.create_all(bind=engine)
\ No newline at end of file
+ASYNC_DRIVERS = {
+    "postgresql": "postgresql+asyncpg",
+    "sqlite": "sqlite+aiosqlite",
+}
+
+
+def async_url(url: str) -> URL:
+    """Map the configured (sync) database URL onto its asyncio driver."""
+    parsed = make_url(url)
+    backend = parsed.get_backend_name()
+    if backend not in ASYNC_DRIVERS:
+        raise ValueError(f"No async driver configured for {backend!r}")
+    return parsed.set(drivername=ASYNC_DRIVERS[backend])
+
+
+def engine_options(url: str, pool_class: type, metrics: PoolMetrics) -> dict:
+    """Pool settings from Settings; SQLite keeps SQLAlchemy's default pools."""
+    options = {"pool_pre_ping": settings.DB_POOL_PRE_PING}
+    if make_url(url).get_backend_name() != "sqlite":
+        options.update(
+            poolclass=timed_pool_class(pool_class, metrics),
+            pool_size=settings.DB_POOL_SIZE,
+            max_overflow=settings.DB_MAX_OVERFLOW,
+            pool_timeout=settings.DB_POOL_TIMEOUT,
+            pool_recycle=settings.DB_POOL_RECYCLE,
+        )
+    return options
+
+
+@functools.cache
+def get_engine() -> Engine:
+    """The sync engine, created on first use so importing the app stays cheap."""
+    engine = create_engine(
+        settings.SQLALCHEMY_DATABASE_URL,
+        **engine_options(settings.SQLALCHEMY_DATABASE_URL, QueuePool, sync_pool_metrics),
+    )
+    instrument_engine(engine, sync_pool_metrics)
+    instrument_queries(engine)
+    return engine
+
+
+@functools.cache
+def get_async_engine() -> AsyncEngine:
+    """The asyncio engine, created on first use."""
+    async_engine = create_async_engine(
+        async_url(settings.SQLALCHEMY_DATABASE_URL),
+        **engine_options(settings.SQLALCHEMY_DATABASE_URL, AsyncAdaptedQueuePool, async_pool_metrics),
+    )
+    instrument_engine(async_engine.sync_engine, async_pool_metrics)
+    instrument_queries(async_engine.sync_engine)
+    return async_engine
+
+
+@functools.cache
+def _sync_sessions() -> sessionmaker:
+    return sessionmaker(autocommit=False, autoflush=False, bind=get_engine())
+
+
+@functools.cache
+def _async_sessions() -> async_sessionmaker:
+    # expire_on_commit is off so attributes stay readable after commit without
+    # an implicit (and, under asyncio, forbidden) lazy refresh.
+    return async_sessionmaker(autoflush=False, expire_on_commit=False, bind=get_async_engine())
+
+
+def SessionLocal(**kw) -> Session:
+    """New sync session; binds the engine on first call."""
+    return _sync_sessions()(**kw)
+
+
+def AsyncSessionLocal(**kw) -> AsyncSession:
+    """New async session; binds the engine on first call."""
+    return _async_sessions()(**kw)
@@ -0,0 +1,9 @@
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+
+_INSERTS = {"postgresql": pg_insert, "sqlite": sqlite_insert}
+
+
+def insert_for(dialect_name: str):
+    """The dialect's INSERT construct, which supports on_conflict_do_update()."""
+    return _INSERTS[dialect_name]
@@ -1,16 +1,48 @@
-from fastapi import Depends, HTTPException, status
+import time
+
+from fastapi import Depends, HTTPException, Request, status
 from fastapi.security import OAuth2PasswordBearer
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from jose import JWTError
 
-from app.database.session import SessionLocal         
+from app.database.session import AsyncSessionLocal, SessionLocal
+from app.core.cache import TTLCache
+from app.core.config import settings
 from app.core.security import JWTAuth            
-from app.crud.user import UserRepository        
-from app.schemas.user import TokenData            
-from app.models.user import RoleEnum, User        
+from app.crud.user import AsyncUserRepository
+from app.schemas.user import TokenData, UserRead
+from app.models.user import RoleEnum
+from app.utils import pubsub_instance
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/auth/login")
 
+# user id -> UserRead, so authenticated requests skip the users lookup.
+principal_cache = TTLCache(settings.PRINCIPAL_CACHE_SIZE, settings.PRINCIPAL_CACHE_TTL_SECONDS)
+# raw token -> user id, so a token's signature is only checked once per TTL.
+token_cache = TTLCache(settings.TOKEN_CACHE_SIZE, settings.PRINCIPAL_CACHE_TTL_SECONDS)
+
+# user id -> invalidation count. A load that started before an invalidation
+# must not refill the cache with the row it read.
+_principal_generation: dict[int, int] = {}
+
+def _drop_principal(user_id: int) -> None:
+    _principal_generation[user_id] = _principal_generation.get(user_id, 0) + 1
+    principal_cache.pop(user_id)
+
+def _on_pubsub_message(message: dict) -> None:
+    if message.get("type") == "principal_invalidated":
+        _drop_principal(message["user_id"])
+
+pubsub_instance.add_listener(_on_pubsub_message)
+
+async def invalidate_principal(user_id: int) -> None:
+    """
+    Drop a cached principal here and, via the broker, in every other worker,
+    so the next request anywhere reloads it from the database.
+    """
+    _drop_principal(user_id)
+    await pubsub_instance.publish({"type": "principal_invalidated", "user_id": user_id, "internal": True})
+
 def get_db():
     """
     Yield a database session, closing it after the request.
@@ -21,12 +53,51 @@ def get_db():
     finally:
         db.close()
 
-def get_current_user(
+async def get_async_db(request: Request):
+    """
+    Yield the request's async database session, closing it after the request.
+
+    The session is kept on request.state so every dependency, service and
+    middleware touching the database within one request shares a single
+    session (and pooled connection) instead of checking out its own.
+    """
+    db = getattr(request.state, "db", None)
+    if db is not None:
+        yield db
+        return
+    async with AsyncSessionLocal() as db:
+        request.state.db = db
+        try:
+            yield db
+        finally:
+            request.state.db = None
+
+def _decode_user_id(token: str) -> int | None:
+    user_id = token_cache.get(token)
+    if user_id is not None:
+        return user_id
+    try:
+        payload = JWTAuth.decode_token(token)
+        user_id = int(payload.get("sub") or 0)
+        role = payload.get("role")
+        if not user_id or not role:
+            return None
+        token_data = TokenData(user_id=user_id, role=role)
+    except (JWTError, ValueError):
+        return None
+    # Never cache a token past its own expiry.
+    ttl = min(token_cache.ttl, payload.get("exp", 0) - time.time())
+    if ttl > 0:
+        token_cache.set(token, token_data.user_id, ttl=ttl)
+    return token_data.user_id
+
+async def get_current_user(
     token: str = Depends(oauth2_scheme),
-    db: Session = Depends(get_db),
-) -> User:
+    db: AsyncSession = Depends(get_async_db),
+) -> UserRead:
     """
-    Decode the JWT, load the user, and return the User model.
+    Decode the JWT and return the authenticated principal, loading the
+    user from the database only on a principal cache miss.
     Raises 401 if invalid or not found.
     """
     
@@ -35,23 +106,23 @@ def get_current_user(
         detail="Could not validate credentials",
         headers={"WWW-Authenticate": "Bearer"},
     )
-    try:
-        payload = JWTAuth.decode_token(token)
-        user_id = int(payload.get("sub") or 0)
-        role = payload.get("role")
-        if not user_id or not role:
-            raise credentials_exception
-        token_data = TokenData(user_id=user_id, role=role)
-    except JWTError:
+    user_id = _decode_user_id(token)
+    if user_id is None:
         raise credentials_exception
 
-    user = UserRepository(db).get(token_data.user_id)
-    if not user:
-        raise credentials_exception
-    return user
+    principal = principal_cache.get(user_id)
+    if principal is None:
+        generation = _principal_generation.get(user_id, 0)
+        user = await AsyncUserRepository(db).get(user_id)
+        if not user:
+            raise credentials_exception
+        principal = UserRead.model_validate(user)
+        if _principal_generation.get(user_id, 0) == generation:
+            principal_cache.set(user_id, principal)
+    return principal
 
 def require_role(*required_roles: RoleEnum):
-    def checker(current_user: User = Depends(get_current_user)) -> User:
+    async def checker(current_user: UserRead = Depends(get_current_user)) -> UserRead:
         if current_user.role not in required_roles:
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
@@ -0,0 +1,43 @@
+from fastapi import Depends, Request
+from fastapi.security import OAuth2PasswordRequestForm
+
+from app.core.config import settings
+from app.dependencies.auth import get_current_user
+from app.schemas.user import UserRead
+from app.utils.ratelimit import rate_limiter
+
+
+def client_ip(request: Request) -> str:
+    # Behind a proxy, run uvicorn with --proxy-headers so this is the real client.
+    return request.client.host if request.client else "unknown"
+
+
+async def limit_login(
+    request: Request,
+    form_data: OAuth2PasswordRequestForm = Depends(),
+) -> None:
+    """
+    Throttle login attempts per client IP, then per account, before any
+    bcrypt work is done. The account bucket slows password guessing against
+    one user even when it is spread over many addresses.
+    """
+    await rate_limiter.check(
+        f"login:ip:{client_ip(request)}", settings.LOGIN_IP_PER_MINUTE, settings.LOGIN_IP_BURST
+    )
+    await rate_limiter.check(
+        f"login:account:{form_data.username.strip().lower()}",
+        settings.LOGIN_ACCOUNT_PER_MINUTE,
+        settings.LOGIN_ACCOUNT_BURST,
+    )
+
+
+async def limit_register(request: Request) -> None:
+    await rate_limiter.check(
+        f"register:ip:{client_ip(request)}", settings.REGISTER_IP_PER_MINUTE, settings.REGISTER_IP_BURST
+    )
+
+
+async def limit_issue_writes(current_user: UserRead = Depends(get_current_user)) -> None:
+    """Per-user quota on issue writes, sized by role (ISSUE_WRITE_QUOTAS)."""
+    per_minute = settings.ISSUE_WRITE_QUOTAS.get(current_user.role.value, 0)
+    await rate_limiter.check(f"issues:write:{current_user.id}", per_minute, settings.ISSUE_WRITE_BURST)
@@ -1,18 +1,24 @@
-from fastapi import FastAPI
+import math
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
 from app.api.auth import router as auth_router
 from app.api.issue import router as issues_router
+from app.api.bulk import router as bulk_router
 from app.api.users import router as users_router  
-from fastapi.staticfiles import StaticFiles
-from app.database.base_class import Base
-from app.database.session import engine, SessionLocal
-from app.crud.user import UserRepository
-from app.schemas.user import UserCreate
-from app.models.user import RoleEnum
 from app.core.config import settings
+from app.core.security import HasherBusy
+from app.core.metrics import InstrumentationMiddleware
+from app.utils.storage import UploadSizeLimitMiddleware
 from app.api.events import router as  events_router
-from apscheduler.schedulers.background import BackgroundScheduler
-from app.utils.aggregator import aggregate_issue_counts
-from datetime import datetime
+from app.api.stats import router as stats_router
+from app.api.metrics import router as metrics_router
+from app.utils.aggregator import aggregate_issue_counts, reconcile_issue_counts
+from app.utils import pubsub_instance
+from app.utils.scheduler import run_exclusive
+from app.utils.ratelimit import RateLimited, purge_idle_buckets
+from app.crud.idempotency import purge_expired_keys
+from datetime import datetime, timedelta
+
 app = FastAPI(
     title="Issues & Insights Tracker",
     version="0.1.0",
@@ -20,36 +26,82 @@ app = FastAPI(
     openapi_url="/api/openapi.json",
 )
 
-scheduler = BackgroundScheduler()
+app.add_middleware(UploadSizeLimitMiddleware)
+app.add_middleware(InstrumentationMiddleware, server_timing=settings.SERVER_TIMING_ENABLED)
+
+scheduler = None
+
+
+@app.exception_handler(HasherBusy)
+async def hasher_busy_handler(request: Request, exc: HasherBusy):
+    return JSONResponse(
+        status_code=503,
+        content={"detail": "Authentication is busy, please retry"},
+        headers={"Retry-After": "1"},
+    )
+
+
+@app.exception_handler(RateLimited)
+async def rate_limited_handler(request: Request, exc: RateLimited):
+    return JSONResponse(
+        status_code=429,
+        content={"detail": "Too many requests"},
+        headers={"Retry-After": str(math.ceil(exc.retry_after))},
+    )
 
 
 @app.on_event("startup")
 def on_startup():
-    Base.metadata.create_all(bind=engine)
-
-    db = SessionLocal()
-    repo = UserRepository(db)
-    if not repo.get_by_email(settings.ADMIN_EMAIL):
-        repo.create(
-            UserCreate(
-                email=settings.ADMIN_EMAIL,
-                password=settings.ADMIN_PASSWORD
-            ),
-            role=RoleEnum.ADMIN
-        )
-    db.close()
+    """
+    Start the scheduled jobs. Schema and admin bootstrap are not done here
+    but by `python -m app.cli bootstrap`, once per deploy.
+    """
+    global scheduler
+    from apscheduler.schedulers.background import BackgroundScheduler
 
+    scheduler = BackgroundScheduler()
+    aggregation_interval = timedelta(minutes=settings.STATS_AGGREGATION_INTERVAL_MINUTES)
+    reconcile_interval = timedelta(minutes=settings.COUNTER_RECONCILE_INTERVAL_MINUTES)
+    scheduler.add_job(
+        run_exclusive("aggregate_issue_counts", aggregation_interval, aggregate_issue_counts),
+        trigger="interval",
+        minutes=settings.STATS_AGGREGATION_INTERVAL_MINUTES,
+        # Give the reconciliation below a head start on a fresh database.
+        next_run_time=datetime.now() + timedelta(minutes=1)
+    )
     scheduler.add_job(
-        aggregate_issue_counts,
+        run_exclusive("reconcile_issue_counts", reconcile_interval, reconcile_issue_counts),
         trigger="interval",
-        minutes=30,
+        minutes=settings.COUNTER_RECONCILE_INTERVAL_MINUTES,
         next_run_time=datetime.now()
     )
+    scheduler.add_job(
+        run_exclusive("purge_idempotency_keys", timedelta(hours=1), purge_expired_keys),
+        trigger="interval",
+        hours=1,
+    )
+    if settings.RATE_LIMIT_STORE == "database":
+        scheduler.add_job(
+            run_exclusive("purge_rate_limit_buckets", timedelta(hours=1), purge_idle_buckets),
+            trigger="interval",
+            hours=1,
+        )
     scheduler.start()
 
-app.mount("/uploads", StaticFiles(directory="uploads"), name="uploads")
+@app.on_event("startup")
+async def start_event_bus():
+    await pubsub_instance.start()
+
+
+@app.on_event("shutdown")
+async def stop_event_bus():
+    await pubsub_instance.stop()
+
 app.include_router(auth_router, prefix="/auth", tags=["auth"])
-app.include_router(issues_router, prefix="/issues", tags=["issues"])
+app.include_router(issues_router)
+app.include_router(bulk_router)
 app.include_router(users_router, prefix="/users", tags=["admin"])
 app.include_router(events_router, tags=["events"])
+app.include_router(stats_router)
+app.include_router(metrics_router, tags=["metrics"])
 
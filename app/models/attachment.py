@@ -1,8 +1,17 @@
 import uuid
-from sqlalchemy import Column, Integer, String, ForeignKey
+from sqlalchemy import BigInteger, Column, Integer, String, ForeignKey
 from sqlalchemy.orm import relationship
 from app.database.base_class import Base
 
+class AttachmentBlob(Base):
+    """One stored file, shared by every attachment with the same content."""
+    __tablename__ = "attachment_blobs"
+
+    sha256 = Column(String(64), primary_key=True)
+    path = Column(String, nullable=False)
+    size = Column(BigInteger, nullable=False)
+    ref_count = Column(Integer, nullable=False, default=0)
+
 class FileAttachment(Base):
     __tablename__ = "file_attachments"
 
@@ -10,5 +19,7 @@ class FileAttachment(Base):
     issue_id = Column(Integer, ForeignKey("issues.id", ondelete="CASCADE"), nullable=False)
     filename = Column(String, nullable=False)     
     filepath = Column(String, nullable=False)      
+    content_hash = Column(String(64), ForeignKey("attachment_blobs.sha256"), index=True)
+    size = Column(BigInteger)
 
     issue = relationship("Issue", back_populates="attachments")
@@ -1,12 +1,38 @@
+import enum
 from datetime import datetime
-from sqlalchemy import Column, Integer, DateTime, Enum
+from sqlalchemy import Column, Integer, DateTime, Enum, Index, String, UniqueConstraint
 from app.database.base_class import Base
-from app.models.issues import StatusEnum
+from app.models.issues import SeverityEnum, StatusEnum
 
 class DailyStats(Base):
     __tablename__ = "daily_stats"
 
     id = Column(Integer, primary_key=True, index=True)
-    timestamp = Column(DateTime, default=datetime.now, nullable=False)
+    timestamp = Column(DateTime, default=datetime.now, nullable=False, index=True)
     status = Column(Enum(StatusEnum), nullable=False)
+    # NULL on snapshots taken before counts were split by severity.
+    severity = Column(Enum(SeverityEnum))
+    count = Column(Integer, nullable=False)
+
+class RollupGranularity(str, enum.Enum):
+    HOUR = "hour"
+    DAY = "day"
+    WEEK = "week"
+
+class StatsRollup(Base):
+    """
+    Issue counts per time bucket, as of the latest snapshot taken in that
+    bucket, for one dimension ("status" or "severity") and value.
+    """
+    __tablename__ = "stats_rollups"
+    __table_args__ = (
+        UniqueConstraint("granularity", "dimension", "value", "bucket_start", name="uq_stats_rollups_bucket"),
+        Index("ix_stats_rollups_range", "granularity", "dimension", "bucket_start"),
+    )
+
+    id = Column(Integer, primary_key=True)
+    granularity = Column(Enum(RollupGranularity), nullable=False)
+    dimension = Column(String(16), nullable=False)
+    value = Column(String(32), nullable=False)
+    bucket_start = Column(DateTime, nullable=False)
     count = Column(Integer, nullable=False)
@@ -0,0 +1,21 @@
+from sqlalchemy import Column, Integer, Enum
+from app.database.base_class import Base
+from app.models.issues import SeverityEnum, StatusEnum
+
+class IssueCount(Base):
+    """Live number of issues per (status, severity), kept in step with writes."""
+    __tablename__ = "issue_counts"
+
+    status = Column(Enum(StatusEnum), primary_key=True)
+    severity = Column(Enum(SeverityEnum), primary_key=True)
+    count = Column(Integer, nullable=False, default=0)
+
+class IssueCollectionVersion(Base):
+    """
+    A single row bumped in every transaction that writes issues, so any
+    worker can tell whether the issue collection changed.
+    """
+    __tablename__ = "issue_collection_version"
+
+    id = Column(Integer, primary_key=True, default=1)
+    version = Column(Integer, nullable=False, default=0)
@@ -1,6 +1,6 @@
 import enum
 from datetime import datetime
-from sqlalchemy import Column, Integer, String, Enum, Text, ForeignKey, DateTime
+from sqlalchemy import Column, Integer, String, Enum, Text, ForeignKey, DateTime, Index, event, func, literal_column
 from sqlalchemy.orm import relationship
 from app.database.base_class import Base
 
@@ -17,14 +17,22 @@ class StatusEnum(str, enum.Enum):
 
 class Issue(Base):
     __tablename__ = "issues"
+    __table_args__ = (
+        # Match the keyset ordering (created_at DESC, id DESC) of the list
+        # endpoint, alone and behind each equality filter it supports.
+        Index("ix_issues_created_at_id", "created_at", "id"),
+        Index("ix_issues_reporter_created_at_id", "reporter_id", "created_at", "id"),
+        Index("ix_issues_status_created_at_id", "status", "created_at", "id"),
+        Index("ix_issues_severity_created_at_id", "severity", "created_at", "id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     title = Column(String(200), nullable=False)
     description = Column(Text, nullable=False)
     severity = Column(Enum(SeverityEnum), default=SeverityEnum.LOW, nullable=False)
     status = Column(Enum(StatusEnum), default=StatusEnum.OPEN, nullable=False)
-    created_at = Column(DateTime, default=datetime.now(), nullable=False)
-    updated_at = Column(DateTime, default=datetime.now(), onupdate=datetime.now(), nullable=False)
+    created_at = Column(DateTime, default=datetime.now, nullable=False)
+    updated_at = Column(DateTime, default=datetime.now, onupdate=datetime.now, nullable=False)
 
 
     reporter_id = Column(Integer, ForeignKey("users.id"), nullable=False)
@@ -33,4 +41,54 @@ class Issue(Base):
         "FileAttachment",
         back_populates="issue",
         cascade="all, delete-orphan",
+        lazy="selectin",
+    )
+
+
+def search_document():
+    """
+    The text-search vector of an issue on Postgres. Literal (not bound)
+    arguments keep it identical to the indexed expression below, which is
+    what lets the planner use the GIN index.
+    """
+    return func.to_tsvector(
+        literal_column("'english'"),
+        Issue.title.op("||")(literal_column("' '")).op("||")(Issue.description),
     )
+
+Index("ix_issues_search", search_document(), postgresql_using="gin").ddl_if(dialect="postgresql")
+
+# SQLite (tests, local runs) gets an external-content FTS5 table kept in
+# step with issues by triggers instead.
+SQLITE_FTS_DDL = (
+    "CREATE VIRTUAL TABLE IF NOT EXISTS issues_fts USING fts5("
+    "title, description, content='issues', content_rowid='id')",
+    "CREATE TRIGGER IF NOT EXISTS issues_fts_ai AFTER INSERT ON issues BEGIN "
+    "INSERT INTO issues_fts(rowid, title, description) VALUES (new.id, new.title, new.description); END",
+    "CREATE TRIGGER IF NOT EXISTS issues_fts_ad AFTER DELETE ON issues BEGIN "
+    "INSERT INTO issues_fts(issues_fts, rowid, title, description) "
+    "VALUES ('delete', old.id, old.title, old.description); END",
+    "CREATE TRIGGER IF NOT EXISTS issues_fts_au AFTER UPDATE OF title, description ON issues BEGIN "
+    "INSERT INTO issues_fts(issues_fts, rowid, title, description) "
+    "VALUES ('delete', old.id, old.title, old.description); "
+    "INSERT INTO issues_fts(rowid, title, description) VALUES (new.id, new.title, new.description); END",
+)
+
+def ensure_sqlite_search_index(connection) -> None:
+    """
+    Create the FTS5 table and triggers if missing. A freshly created index
+    is rebuilt from the issues already in the table.
+    """
+    if connection.dialect.name != "sqlite":
+        return
+    exists = connection.exec_driver_sql(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'issues_fts'"
+    ).first()
+    for statement in SQLITE_FTS_DDL:
+        connection.exec_driver_sql(statement)
+    if not exists:
+        connection.exec_driver_sql("INSERT INTO issues_fts(issues_fts) VALUES ('rebuild')")
+
+@event.listens_for(Issue.__table__, "after_create")
+def create_sqlite_search_index(target, connection, **kw):
+    ensure_sqlite_search_index(connection)
@@ -0,0 +1,15 @@
+from sqlalchemy import Boolean, Column, Float, String
+from app.database.base_class import Base
+
+class RateLimitBucket(Base):
+    """
+    A token bucket shared by every worker, for RATE_LIMIT_STORE="database".
+    `granted` records whether the last take() succeeded, so a single UPDATE
+    ... RETURNING can both refill-and-take and report the outcome.
+    """
+    __tablename__ = "rate_limit_buckets"
+
+    key = Column(String(255), primary_key=True)
+    tokens = Column(Float, nullable=False)
+    updated_at = Column(Float, nullable=False, index=True)
+    granted = Column(Boolean, nullable=False, default=True)
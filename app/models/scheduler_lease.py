@@ -0,0 +1,17 @@
+from sqlalchemy import Column, DateTime, Float, String
+from app.database.base_class import Base
+
+class SchedulerLease(Base):
+    """
+    Cluster-wide lease for a scheduled job: whichever process holds an
+    unexpired lease runs the job; everyone else skips that tick.
+    """
+    __tablename__ = "scheduler_leases"
+
+    name = Column(String(64), primary_key=True)
+    owner = Column(String(128), nullable=False)
+    expires_at = Column(DateTime, nullable=False)
+    last_started_at = Column(DateTime)
+    last_finished_at = Column(DateTime)
+    last_outcome = Column(String(16))
+    last_duration_seconds = Column(Float)
@@ -2,6 +2,7 @@ from pydantic import BaseModel, ConfigDict, computed_field
 
 class AttachmentRead(BaseModel):
     id: int
+    issue_id: int
     filename: str
     filepath: str
 
@@ -9,4 +10,4 @@ class AttachmentRead(BaseModel):
 
     @computed_field
     def url(self) -> str:
-        return f"/{self.filepath}"
+        return f"/issues/{self.issue_id}/attachments/{self.id}"
@@ -1,4 +1,4 @@
-from pydantic import BaseModel, ConfigDict
+from pydantic import BaseModel, ConfigDict, model_validator
 from typing import Optional
 from datetime import datetime
 import enum
@@ -35,3 +35,46 @@ class IssueRead(IssueBase):
     attachments: list[AttachmentRead] = []
 
     model_config = ConfigDict(from_attributes=True)
+
+class IssuePage(BaseModel):
+    items: list[IssueRead]
+    next_cursor: Optional[str] = None
+
+class IssueImport(IssueBase):
+    """One issue in a bulk import; reporter defaults to the importing user."""
+    status: StatusEnum = StatusEnum.OPEN
+    reporter_id: Optional[int] = None
+    created_at: Optional[datetime] = None
+
+class IssueFilter(BaseModel):
+    status: Optional[StatusEnum] = None
+    severity: Optional[SeverityEnum] = None
+    reporter_id: Optional[int] = None
+
+class BulkStatusUpdate(BaseModel):
+    """Target issues either by id or by filter, not both."""
+    status: StatusEnum
+    ids: Optional[list[int]] = None
+    filter: Optional[IssueFilter] = None
+
+    @model_validator(mode="after")
+    def one_target(self):
+        if (self.ids is None) == (self.filter is None):
+            raise ValueError("Provide exactly one of 'ids' or 'filter'")
+        return self
+
+class BulkResult(BaseModel):
+    count: int
+
+class IssueSearchHit(BaseModel):
+    issue: IssueRead
+    rank: float
+    title_highlight: str
+    description_highlight: str
+
+    model_config = ConfigDict(from_attributes=True)
+
+class IssueSearchPage(BaseModel):
+    items: list[IssueSearchHit]
+    limit: int
+    offset: int
@@ -0,0 +1,39 @@
+import enum
+from datetime import datetime
+
+from pydantic import BaseModel, ConfigDict
+from app.schemas.issues import SeverityEnum, StatusEnum
+
+class RollupGranularity(str, enum.Enum):
+    HOUR = "hour"
+    DAY = "day"
+    WEEK = "week"
+
+class StatsDimension(str, enum.Enum):
+    STATUS = "status"
+    SEVERITY = "severity"
+
+class IssueCountRead(BaseModel):
+    status: StatusEnum
+    severity: SeverityEnum
+    count: int
+
+    model_config = ConfigDict(from_attributes=True)
+
+class IssueCountsRead(BaseModel):
+    total: int
+    by_status: dict[StatusEnum, int]
+    by_severity: dict[SeverityEnum, int]
+    cells: list[IssueCountRead]
+
+class StatsPoint(BaseModel):
+    bucket_start: datetime
+    value: str
+    count: int
+
+class StatsSeries(BaseModel):
+    bucket: RollupGranularity
+    dimension: StatsDimension
+    start: datetime
+    end: datetime
+    points: list[StatsPoint]
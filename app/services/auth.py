@@ -1,43 +1,47 @@
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from jose import JWTError
 from datetime import timedelta
 
-from app.crud.user import UserRepository
+from app.crud.user import AsyncUserRepository
 from app.schemas.user import UserCreate, Token, TokenData, UserRead
 from app.core.security import JWTAuth, PasswordHasher
-from app.database.session import SessionLocal
 from app.models.user import RoleEnum
 from app.core.config import settings
-from app.dependencies.auth import get_db
+from app.dependencies.auth import get_async_db
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/auth/login")
 
 class AuthService:
-    def __init__(self, db: Session = Depends(get_db)):
+    def __init__(self, db: AsyncSession = Depends(get_async_db)):
         self.db = db
-        self.user_repo = UserRepository(db)
+        self.user_repo = AsyncUserRepository(db)
 
-    def register(self, user_in: UserCreate) -> UserRead:
-        if self.user_repo.get_by_email(user_in.email):
+    async def register(self, user_in: UserCreate) -> UserRead:
+        if await self.user_repo.get_by_email(user_in.email):
             raise HTTPException(status_code=400, detail="Email already registered")
-        user = self.user_repo.create(user_in)
+        user = await self.user_repo.create(user_in)
         return UserRead.from_orm(user)
 
-    def authenticate(self, username: str, password: str) -> Token:
-        user = self.user_repo.get_by_email(username)
-        if not user or not PasswordHasher.verify(password, user.hashed_password):
+    async def authenticate(self, username: str, password: str) -> Token:
+        user = await self.user_repo.get_by_email(username)
+        verified, new_hash = False, None
+        if user:
+            verified, new_hash = await PasswordHasher.verify_and_update_async(password, user.hashed_password)
+        if not verified:
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Incorrect username or password",
                 headers={"WWW-Authenticate": "Bearer"},
             )
+        if new_hash:
+            await self.user_repo.update_password_hash(user, new_hash)
         expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
         token = JWTAuth.create_token(subject=user.id, role=user.role.value, expires_delta=expires)
         return Token(access_token=token)
 
-    def get_current_user(self, token: str = Depends(oauth2_scheme)) -> UserRead:
+    async def get_current_user(self, token: str = Depends(oauth2_scheme)) -> UserRead:
         credentials_exception = HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Could not validate credentials",
@@ -53,7 +57,7 @@ class AuthService:
         except JWTError:
             raise credentials_exception
 
-        user = self.user_repo.get(token_data.user_id)
+        user = await self.user_repo.get(token_data.user_id)
         if not user:
             raise credentials_exception
         return UserRead.from_orm(user)
@@ -63,4 +67,4 @@ class AuthService:
             if current_user.role != required_role.value:
                 raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Operation not permitted")
             return current_user
-        return role_checker
\ No newline at end of file
+        return role_checker
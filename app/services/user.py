@@ -1,18 +1,19 @@
 from fastapi import Depends, HTTPException
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.crud.user import UserRepository
+from app.crud.user import AsyncUserRepository
 from app.schemas.user import UserRead
 from app.models.user import RoleEnum
-from app.dependencies.auth import get_db
+from app.dependencies.auth import get_async_db, invalidate_principal
 
 class UserService:
-    def __init__(self, db: Session = Depends(get_db)):
-        self.repo = UserRepository(db)
+    def __init__(self, db: AsyncSession = Depends(get_async_db)):
+        self.repo = AsyncUserRepository(db)
 
-    def change_role(self, user_id: int, new_role: RoleEnum) -> UserRead:
-        user = self.repo.get(user_id)
+    async def change_role(self, user_id: int, new_role: RoleEnum) -> UserRead:
+        user = await self.repo.get(user_id)
         if not user:
             raise HTTPException(status_code=404, detail="User not found")
-        updated = self.repo.update_role(user, new_role)
+        updated = await self.repo.update_role(user, new_role)
+        await invalidate_principal(user_id)
         return UserRead.from_orm(updated)
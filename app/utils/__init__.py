@@ -1,3 +1,18 @@
-from app.utils.pubsub import PubSub
+from app.core.config import settings
+from app.utils.broker import Broker, InMemoryBroker, PostgresBroker
+from app.utils.pubsub import OverflowPolicy, PubSub
 
-pubsub_instance = PubSub() 
\ No newline at end of file
+
+def build_broker() -> Broker:
+    if settings.PUBSUB_BROKER == "postgres":
+        from app.database.session import get_async_engine
+        return PostgresBroker(get_async_engine, settings.PUBSUB_CHANNEL)
+    return InMemoryBroker()
+
+
+pubsub_instance = PubSub(
+    queue_size=settings.PUBSUB_QUEUE_SIZE,
+    overflow_policy=OverflowPolicy(settings.PUBSUB_OVERFLOW_POLICY),
+    broker=build_broker(),
+    replay_size=settings.SSE_REPLAY_BUFFER_SIZE,
+)
@@ -1,25 +1,111 @@
-from sqlalchemy import func
+from collections import Counter
+from datetime import datetime, timedelta
+
+from sqlalchemy import delete, func, select
+from app.core.config import settings
+from app.crud.stats import bucket_floor, stats_cache
 from app.database.session import SessionLocal
-from app.models.issues import Issue
-from app.models.daily_stats import DailyStats
+from app.database.upsert import insert_for
+from app.models.issues import Issue, SeverityEnum, StatusEnum
+from app.models.issue_counts import IssueCount
+from app.models.daily_stats import DailyStats, RollupGranularity, StatsRollup
 
 def aggregate_issue_counts() -> None:
     """
-    Counts current issues by status and writes a row into daily_stats
-    for each status.
+    Snapshots the live issue counts into daily_stats, one row per
+    (status, severity), and folds the snapshot into the hour/day/week
+    rollups. Old raw snapshots and hourly rollups are then pruned.
+    Reads the small issue_counts table, never issues itself.
+    """
+    db = SessionLocal()
+    try:
+        taken_at = datetime.now()
+        totals = {
+            "status": Counter({s.value: 0 for s in StatusEnum}),
+            "severity": Counter({s.value: 0 for s in SeverityEnum}),
+        }
+        for status, severity, cnt in db.query(IssueCount.status, IssueCount.severity, IssueCount.count):
+            db.add(DailyStats(timestamp=taken_at, status=status, severity=severity, count=cnt))
+            totals["status"][status.value] += cnt
+            totals["severity"][severity.value] += cnt
+
+        # The latest snapshot in a bucket is the bucket's value.
+        upsert = insert_for(db.get_bind().dialect.name)
+        for granularity in RollupGranularity:
+            bucket_start = bucket_floor(taken_at, granularity)
+            for dimension, counts in totals.items():
+                for value, cnt in counts.items():
+                    db.execute(
+                        upsert(StatsRollup)
+                        .values(
+                            granularity=granularity,
+                            dimension=dimension,
+                            value=value,
+                            bucket_start=bucket_start,
+                            count=cnt,
+                        )
+                        .on_conflict_do_update(
+                            index_elements=["granularity", "dimension", "value", "bucket_start"],
+                            set_={"count": cnt},
+                        )
+                    )
+
+        db.execute(delete(DailyStats).where(
+            DailyStats.timestamp < taken_at - timedelta(days=settings.STATS_RAW_RETENTION_DAYS)
+        ))
+        db.execute(delete(StatsRollup).where(
+            StatsRollup.granularity == RollupGranularity.HOUR,
+            StatsRollup.bucket_start < taken_at - timedelta(days=settings.STATS_HOURLY_RETENTION_DAYS),
+        ))
+        db.commit()
+    finally:
+        db.close()
+    stats_cache.clear()
+
+def reconcile_issue_counts() -> int:
+    """
+    Recounts issues per (status, severity) and corrects any drift in
+    issue_counts, returning the number of cells that were fixed.
+
+    The counter rows are locked first, so writers that adjust them wait for
+    the recount instead of racing it (SQLite serializes writers anyway).
     """
     db = SessionLocal()
     try:
-        results = (
-            db.query(Issue.status, func.count(Issue.id))
-              .group_by(Issue.status)
-              .all()
-        )
+        counters = {
+            (row.status, row.severity): row
+            for row in db.scalars(select(IssueCount).with_for_update())
+        }
+        actual = {
+            (status, severity): cnt
+            for status, severity, cnt in db.execute(
+                select(Issue.status, Issue.severity, func.count(Issue.id))
+                .group_by(Issue.status, Issue.severity)
+            )
+        }
 
-        for status, cnt in results:
-            stat = DailyStats(status=status, count=cnt)
-            db.add(stat)
+        fixed = 0
+        for key in counters.keys() | actual.keys():
+            expected = actual.get(key, 0)
+            row = counters.get(key)
+            if row is None:
+                # No row to lock: a writer may create this cell concurrently,
+                # so upsert rather than insert.
+                db.execute(
+                    insert_for(db.get_bind().dialect.name)(IssueCount)
+                    .values(status=key[0], severity=key[1], count=expected)
+                    .on_conflict_do_update(
+                        index_elements=[IssueCount.status, IssueCount.severity],
+                        set_={"count": expected},
+                    )
+                )
+            elif row.count != expected:
+                row.count = expected
+            else:
+                continue
+            fixed += 1
 
         db.commit()
+        return fixed
     finally:
         db.close()
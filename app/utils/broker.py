@@ -0,0 +1,117 @@
+import asyncio
+import json
+import logging
+from typing import Callable
+
+from sqlalchemy import text
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+logger = logging.getLogger(__name__)
+
+Deliver = Callable[[dict], None]
+
+
+class Broker:
+    """
+    Transport between PubSub instances. publish() hands a message to the
+    broker, and the broker calls `deliver` in every process it reaches.
+    """
+    async def start(self, deliver: Deliver) -> None:
+        raise NotImplementedError
+
+    async def publish(self, message: dict) -> None:
+        raise NotImplementedError
+
+    async def stop(self) -> None:
+        pass
+
+
+class InMemoryBroker(Broker):
+    """Single-process broker: delivers straight back to the local PubSub."""
+    def __init__(self):
+        self._deliver: Deliver | None = None
+
+    async def start(self, deliver: Deliver) -> None:
+        self._deliver = deliver
+
+    async def publish(self, message: dict) -> None:
+        self._deliver(message)
+
+
+class PostgresBroker(Broker):
+    """
+    Broker over Postgres LISTEN/NOTIFY, so every worker sharing the database
+    sees every event. Notifications go out through the application's pool;
+    each process holds one extra asyncpg connection to listen on.
+    """
+    # NOTIFY payloads are capped at 8000 bytes by Postgres.
+    MAX_PAYLOAD = 7900
+    RECONNECT_DELAY = 1.0
+
+    def __init__(self, engine_factory: Callable[[], AsyncEngine], channel: str):
+        self.engine_factory = engine_factory
+        self.channel = channel
+        self._deliver: Deliver | None = None
+        self._conn = None
+        self._closing = False
+
+    @property
+    def engine(self) -> AsyncEngine:
+        return self.engine_factory()
+
+    async def start(self, deliver: Deliver) -> None:
+        self._deliver = deliver
+        await self._listen()
+
+    async def _listen(self) -> None:
+        import asyncpg
+
+        dsn = make_url(self.engine.url).set(drivername="postgresql")
+        self._conn = await asyncpg.connect(dsn.render_as_string(hide_password=False))
+        self._conn.add_termination_listener(self._on_terminated)
+        await self._conn.add_listener(self.channel, self._on_notify)
+
+    def _on_notify(self, connection, pid, channel, payload) -> None:
+        try:
+            message = json.loads(payload)
+        except ValueError:
+            logger.warning("Dropping malformed notification on %s", channel)
+            return
+        self._deliver(message)
+
+    def _on_terminated(self, connection) -> None:
+        if not self._closing:
+            asyncio.get_running_loop().create_task(self._reconnect())
+
+    async def _reconnect(self) -> None:
+        while not self._closing:
+            await asyncio.sleep(self.RECONNECT_DELAY)
+            try:
+                await self._listen()
+                return
+            except Exception:
+                logger.exception("Reconnecting event listener failed, retrying")
+
+    async def publish(self, message: dict) -> None:
+        payload = json.dumps(message)
+        if len(payload.encode()) > self.MAX_PAYLOAD:
+            # Too large to notify: send a reference clients can refetch.
+            issue = message.get("issue") or {}
+            payload = json.dumps({
+                "type": message.get("type"),
+                "event_id": message.get("event_id"),
+                "issue_id": issue.get("id", message.get("issue_id")),
+                "truncated": True,
+            })
+        async with self.engine.begin() as conn:
+            await conn.execute(
+                text("SELECT pg_notify(:channel, :payload)"),
+                {"channel": self.channel, "payload": payload},
+            )
+
+    async def stop(self) -> None:
+        self._closing = True
+        if self._conn is not None:
+            await self._conn.close()
+            self._conn = None
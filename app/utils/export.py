@@ -0,0 +1,40 @@
+import csv
+import enum
+import io
+import json
+from datetime import datetime
+from typing import Iterable
+
+from sqlalchemy import Row
+
+EXPORT_FIELDS = (
+    "id",
+    "title",
+    "description",
+    "severity",
+    "status",
+    "reporter_id",
+    "created_at",
+    "updated_at",
+)
+
+def _plain(value):
+    if isinstance(value, enum.Enum):
+        return value.value
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return value
+
+def ndjson_chunk(rows: Iterable[Row]) -> str:
+    return "".join(
+        json.dumps(dict(zip(EXPORT_FIELDS, map(_plain, row)))) + "\n"
+        for row in rows
+    )
+
+def csv_chunk(rows: Iterable[Row], header: bool = False) -> str:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    if header:
+        writer.writerow(EXPORT_FIELDS)
+    writer.writerows(map(_plain, row) for row in rows)
+    return buffer.getvalue()
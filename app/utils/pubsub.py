@@ -1,22 +1,225 @@
 import asyncio
+import enum
+import itertools
+import time
+from collections import deque
+from typing import Callable
+
+from app.core.metrics import timed
+from app.utils.broker import Broker, InMemoryBroker
+
+
+class OverflowPolicy(str, enum.Enum):
+    DROP_OLDEST = "drop_oldest"
+    COALESCE = "coalesce"
+    DISCONNECT = "disconnect"
+
+
+class SubscriptionClosed(Exception):
+    """Raised by Subscription.get() once the subscriber has been evicted."""
+
+
+# Lifecycle events are never merged or dropped by coalescing.
+LIFECYCLE_EVENTS = frozenset({"issue_created", "issue_deleted"})
+
+
+def coalesce_key(message: dict):
+    """Events of the same type about the same issue supersede each other when coalescing."""
+    if message.get("type") in LIFECYCLE_EVENTS:
+        return None
+    issue = message.get("issue") or {}
+    issue_id = issue.get("id", message.get("issue_id"))
+    if issue_id is None:
+        return None
+    return message.get("type"), issue_id
+
+
+class Subscription:
+    """
+    A bounded per-subscriber buffer. offer() never blocks: when the buffer
+    is full the overflow policy decides what gives way.
+    """
+    _ids = itertools.count(1)
+
+    def __init__(self, maxsize: int, policy: OverflowPolicy):
+        self.id = next(self._ids)
+        self.maxsize = maxsize
+        self.policy = policy
+        self.closed = False
+        self.delivered = 0
+        self.dropped = 0
+        self.coalesced = 0
+        self.max_lag = 0
+        self._buffer: deque[dict] = deque()
+        self._ready = asyncio.Event()
+
+    @property
+    def lag(self) -> int:
+        """Number of published messages not yet consumed."""
+        return len(self._buffer)
+
+    def offer(self, message: dict) -> None:
+        if self.closed:
+            return
+        if len(self._buffer) >= self.maxsize:
+            if self.policy is OverflowPolicy.DISCONNECT:
+                self.close()
+                return
+            if self.policy is OverflowPolicy.COALESCE:
+                if self._coalesce(message):
+                    return
+                if not self._drop_oldest_update():
+                    # Only lifecycle events are queued; the client must resync.
+                    self.close()
+                    return
+            else:
+                self._buffer.popleft()
+                self.dropped += 1
+        self._buffer.append(message)
+        self.max_lag = max(self.max_lag, len(self._buffer))
+        self._ready.set()
+
+    def _coalesce(self, message: dict) -> bool:
+        key = coalesce_key(message)
+        if key is None:
+            return False
+        for index, queued in enumerate(self._buffer):
+            if coalesce_key(queued) == key:
+                # Keep the original position so ordering against other events holds.
+                self._buffer[index] = message
+                self.coalesced += 1
+                self._ready.set()
+                return True
+        return False
+
+    def _drop_oldest_update(self) -> bool:
+        for index, queued in enumerate(self._buffer):
+            if queued.get("type") not in LIFECYCLE_EVENTS:
+                del self._buffer[index]
+                self.dropped += 1
+                return True
+        return False
+
+    async def get(self) -> dict:
+        while not self._buffer:
+            if self.closed:
+                raise SubscriptionClosed()
+            self._ready.clear()
+            await self._ready.wait()
+        self.delivered += 1
+        return self._buffer.popleft()
+
+    def close(self) -> None:
+        self.closed = True
+        self._buffer.clear()
+        self._ready.set()
+
+    def stats(self) -> dict:
+        return {
+            "id": self.id,
+            "lag": self.lag,
+            "max_lag": self.max_lag,
+            "delivered": self.delivered,
+            "dropped": self.dropped,
+            "coalesced": self.coalesced,
+        }
+
 
 class PubSub:
-    def __init__(self):
-        self.subscribers: list[asyncio.Queue] = []
+    def __init__(
+        self,
+        queue_size: int = 256,
+        overflow_policy: OverflowPolicy = OverflowPolicy.DROP_OLDEST,
+        broker: Broker | None = None,
+        replay_size: int = 1000,
+    ):
+        self.queue_size = queue_size
+        self.overflow_policy = overflow_policy
+        self.broker = broker or InMemoryBroker()
+        self.subscribers: dict[int, Subscription] = {}
+        self.listeners: list[Callable[[dict], None]] = []
+        self.evicted = 0
+        self.history: deque[dict] = deque(maxlen=replay_size)
+        self._clock = 0
+        self._started = False
+        self._start_lock = asyncio.Lock()
+
+    async def start(self) -> None:
+        async with self._start_lock:
+            if not self._started:
+                await self.broker.start(self._dispatch)
+                self._started = True
+
+    async def stop(self) -> None:
+        if self._started:
+            await self.broker.stop()
+            self._started = False
 
-    async def subscribe(self) -> asyncio.Queue:
-        q: asyncio.Queue = asyncio.Queue()
-        self.subscribers.append(q)
-        return q
+    async def subscribe(self) -> Subscription:
+        await self.start()
+        sub = Subscription(self.queue_size, self.overflow_policy)
+        self.subscribers[sub.id] = sub
+        return sub
 
-    async def unsubscribe(self, q: asyncio.Queue):
-        try:
-            self.subscribers.remove(q)
-        except ValueError:
-            pass
+    async def unsubscribe(self, sub: Subscription):
+        self.subscribers.pop(sub.id, None)
+
+    def add_listener(self, listener: Callable[[dict], None]) -> None:
+        """Call `listener` synchronously for every dispatched message; it must not block."""
+        self.listeners.append(listener)
+
+    def _next_event_id(self) -> int:
+        """
+        Monotonic event id: wall-clock microseconds, but never below the
+        newest id this process has seen, so ids from different workers
+        interleave in roughly publish order and never go backwards locally.
+        """
+        self._clock = max(time.time_ns() // 1000, self._clock + 1)
+        return self._clock
 
     async def publish(self, message: dict):
-        for q in self.subscribers:
-            await q.put(message)
+        """Stamp a JSON-serializable message with an event id and hand it to the broker."""
+        await self.start()
+        with timed("pubsub_publish"):
+            await self.broker.publish({**message, "event_id": self._next_event_id()})
+
+    def replay(self, last_event_id: int) -> tuple[list[dict], bool]:
+        """
+        Return the buffered events delivered after `last_event_id`, and
+        whether that event is still in the buffer (False means events may
+        have been missed). Ids are stamped by the publishing worker, so
+        delivery order can differ from id order; replay follows delivery
+        order. Call straight after subscribe(), with no await in between, so
+        the replay and the live subscription neither overlap nor leave a gap.
+        """
+        history = list(self.history)
+        for index in range(len(history) - 1, -1, -1):
+            if history[index].get("event_id") == last_event_id:
+                return history[index + 1:], True
+        # Evicted, or from before this process: best effort by id.
+        return [m for m in history if m.get("event_id", 0) > last_event_id], False
 
+    def _dispatch(self, message: dict) -> None:
+        """
+        Fan out without awaiting any subscriber; slow ones overflow instead.
+        Messages marked internal (worker-to-worker signals such as cache
+        invalidation) reach listeners only, never SSE clients or the replay buffer.
+        """
+        self._clock = max(self._clock, message.get("event_id") or 0)
+        for listener in self.listeners:
+            listener(message)
+        if message.get("internal"):
+            return
+        self.history.append(message)
+        for sub in list(self.subscribers.values()):
+            sub.offer(message)
+            if sub.closed:
+                self.subscribers.pop(sub.id, None)
+                self.evicted += 1
 
+    def stats(self) -> dict:
+        return {
+            "subscribers": len(self.subscribers),
+            "evicted": self.evicted,
+            "lag": [sub.stats() for sub in self.subscribers.values()],
+        }
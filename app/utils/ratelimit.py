@@ -0,0 +1,120 @@
+import time
+from collections import OrderedDict
+
+from sqlalchemy import case, delete, literal, update
+
+from app.core.config import settings
+from app.database.upsert import insert_for
+from app.models.rate_limit import RateLimitBucket
+
+
+class RateLimited(Exception):
+    """Raised when a request exceeds its rate limit."""
+    def __init__(self, retry_after: float):
+        super().__init__(f"Rate limit exceeded, retry in {retry_after:.1f}s")
+        self.retry_after = retry_after
+
+
+class BucketStore:
+    """
+    Token buckets holding up to `burst` tokens and refilling at `rate` per
+    second. take() spends `cost` tokens if available and returns 0, or
+    returns how many seconds until they will be.
+    """
+    async def take(self, key: str, rate: float, burst: int, cost: float = 1.0) -> float:
+        raise NotImplementedError
+
+
+class MemoryBucketStore(BucketStore):
+    """
+    Per-process buckets. Everything runs on the event loop, so no lock is
+    needed; the least recently used keys are dropped beyond `max_keys`
+    (an evicted bucket just starts full again).
+    """
+    def __init__(self, max_keys: int):
+        self.max_keys = max_keys
+        self._buckets: OrderedDict[str, tuple[float, float]] = OrderedDict()
+
+    async def take(self, key: str, rate: float, burst: int, cost: float = 1.0) -> float:
+        now = time.monotonic()
+        tokens, updated = self._buckets.get(key, (burst, now))
+        tokens = min(burst, tokens + (now - updated) * rate)
+        granted = tokens >= cost
+        if granted:
+            tokens -= cost
+        self._buckets[key] = (tokens, now)
+        self._buckets.move_to_end(key)
+        if len(self._buckets) > self.max_keys:
+            self._buckets.popitem(last=False)
+        return 0.0 if granted else (cost - tokens) / rate
+
+
+class DatabaseBucketStore(BucketStore):
+    """
+    Buckets in the rate_limit_buckets table, shared by every worker. Each
+    take() is an insert-if-missing plus one conditional UPDATE ... RETURNING,
+    so concurrent takes on a key serialize on its row lock.
+    """
+    def __init__(self, session_factory):
+        self.session_factory = session_factory
+
+    async def take(self, key: str, rate: float, burst: int, cost: float = 1.0) -> float:
+        now = time.time()
+        refilled = RateLimitBucket.tokens + (literal(now) - RateLimitBucket.updated_at) * rate
+        available = case((refilled > burst, literal(float(burst))), else_=refilled)
+        async with self.session_factory() as db:
+            dialect = db.get_bind().dialect.name
+            await db.execute(
+                insert_for(dialect)(RateLimitBucket)
+                .values(key=key, tokens=float(burst), updated_at=now, granted=True)
+                .on_conflict_do_nothing(index_elements=[RateLimitBucket.key])
+            )
+            tokens, granted = (await db.execute(
+                update(RateLimitBucket)
+                .where(RateLimitBucket.key == key)
+                .values(
+                    tokens=case((available >= cost, available - cost), else_=available),
+                    granted=available >= cost,
+                    updated_at=now,
+                )
+                .returning(RateLimitBucket.tokens, RateLimitBucket.granted)
+            )).one()
+            await db.commit()
+        return 0.0 if granted else (cost - tokens) / rate
+
+class RateLimiter:
+    def __init__(self, store: BucketStore, enabled: bool = True):
+        self.store = store
+        self.enabled = enabled
+
+    async def check(self, key: str, per_minute: float, burst: int, cost: float = 1.0) -> None:
+        """Spend from the bucket `key`, raising RateLimited when it is empty."""
+        if not self.enabled or per_minute <= 0:
+            return
+        retry_after = await self.store.take(key, per_minute / 60.0, burst, cost)
+        if retry_after:
+            raise RateLimited(retry_after)
+
+
+def purge_idle_buckets(idle_seconds: float = 86400) -> int:
+    """Drop shared buckets untouched for `idle_seconds`; by then they would be full anyway."""
+    from app.database.session import SessionLocal
+    db = SessionLocal()
+    try:
+        deleted = db.execute(
+            delete(RateLimitBucket).where(RateLimitBucket.updated_at < time.time() - idle_seconds)
+        ).rowcount
+        db.commit()
+        return deleted
+    finally:
+        db.close()
+
+
+def build_bucket_store() -> BucketStore:
+    if settings.RATE_LIMIT_STORE == "database":
+        from app.database.session import AsyncSessionLocal
+        return DatabaseBucketStore(AsyncSessionLocal)
+    return MemoryBucketStore(settings.RATE_LIMIT_MAX_KEYS)
+
+
+rate_limiter = RateLimiter(build_bucket_store(), enabled=settings.RATE_LIMIT_ENABLED)
@@ -0,0 +1,146 @@
+import logging
+import os
+import socket
+import threading
+import time
+import uuid
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Callable
+
+from sqlalchemy import update
+from sqlalchemy.exc import IntegrityError
+
+from app.database.session import SessionLocal
+from app.models.scheduler_lease import SchedulerLease
+
+logger = logging.getLogger(__name__)
+
+INSTANCE_ID = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+
+@dataclass
+class JobStats:
+    runs: int = 0
+    failures: int = 0
+    skipped: int = 0
+    last_outcome: str | None = None
+    last_duration_seconds: float | None = None
+    total_duration_seconds: float = 0.0
+
+# Per-process view of the jobs this process ran or skipped.
+job_stats: dict[str, JobStats] = {}
+_stats_lock = threading.Lock()
+
+def _record(name: str, outcome: str, duration: float | None = None) -> None:
+    with _stats_lock:
+        stats = job_stats.setdefault(name, JobStats())
+        if outcome == "skipped":
+            stats.skipped += 1
+            return
+        stats.runs += 1
+        stats.failures += outcome == "failure"
+        stats.last_outcome = outcome
+        stats.last_duration_seconds = duration
+        stats.total_duration_seconds += duration
+
+def acquire_lease(name: str, ttl: timedelta) -> bool:
+    """Take the named lease for `ttl` if it is free or expired; False if another process holds it."""
+    now = datetime.utcnow()
+    db = SessionLocal()
+    try:
+        taken = db.execute(
+            update(SchedulerLease)
+            .where(SchedulerLease.name == name, SchedulerLease.expires_at <= now)
+            .values(owner=INSTANCE_ID, expires_at=now + ttl, last_started_at=now)
+        ).rowcount
+        if not taken:
+            if db.get(SchedulerLease, name) is not None:
+                db.rollback()
+                return False
+            db.add(SchedulerLease(name=name, owner=INSTANCE_ID, expires_at=now + ttl, last_started_at=now))
+        db.commit()
+        return True
+    except IntegrityError:
+        # Another process created the lease row first.
+        db.rollback()
+        return False
+    finally:
+        db.close()
+
+def _renew_lease(name: str, ttl: timedelta) -> None:
+    db = SessionLocal()
+    try:
+        db.execute(
+            update(SchedulerLease)
+            .where(SchedulerLease.name == name, SchedulerLease.owner == INSTANCE_ID)
+            .values(expires_at=datetime.utcnow() + ttl)
+        )
+        db.commit()
+    finally:
+        db.close()
+
+def _keep_lease(name: str, ttl: timedelta, done: threading.Event) -> None:
+    """Extend the lease every third of its TTL until `done` is set."""
+    while not done.wait(ttl.total_seconds() / 3):
+        try:
+            _renew_lease(name, ttl)
+        except Exception:
+            logger.exception("Could not renew lease for job %s", name)
+
+def _finish_lease(name: str, outcome: str, duration: float, expires_at: datetime) -> None:
+    now = datetime.utcnow()
+    db = SessionLocal()
+    try:
+        db.execute(
+            update(SchedulerLease)
+            .where(SchedulerLease.name == name, SchedulerLease.owner == INSTANCE_ID)
+            .values(
+                expires_at=max(expires_at, now),
+                last_finished_at=now,
+                last_outcome=outcome,
+                last_duration_seconds=duration,
+            )
+        )
+        db.commit()
+    finally:
+        db.close()
+
+def run_exclusive(name: str, interval: timedelta, fn: Callable[[], object]) -> Callable[[], None]:
+    """
+    Wrap `fn` so that, with the same schedule in every worker, it runs once
+    per interval cluster-wide. The lease lapses slightly before the next tick
+    so that tick can be taken by any worker, including this one. A run that
+    outlasts the lease keeps renewing it, so no other worker starts the job
+    while it is still running.
+    """
+    ttl = interval * 0.9
+
+    def job() -> None:
+        lease_until = datetime.utcnow() + ttl
+        if not acquire_lease(name, ttl):
+            _record(name, "skipped")
+            return
+        done = threading.Event()
+        renewer = threading.Thread(target=_keep_lease, args=(name, ttl, done), name=f"lease-{name}", daemon=True)
+        renewer.start()
+        started = time.perf_counter()
+        outcome = "failure"
+        try:
+            fn()
+            outcome = "success"
+        except Exception:
+            logger.exception("Scheduled job %s failed", name)
+        finally:
+            done.set()
+            renewer.join()
+            duration = time.perf_counter() - started
+            _record(name, outcome, duration)
+            logger.info("Scheduled job %s finished: %s in %.3fs", name, outcome, duration)
+            try:
+                # Hold the lease for the rest of this tick, or release it now if overran.
+                _finish_lease(name, outcome, duration, lease_until)
+            except Exception:
+                logger.exception("Could not record outcome of job %s", name)
+
+    job.__name__ = name
+    return job
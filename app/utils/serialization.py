@@ -0,0 +1,32 @@
+from app.models.attachment import FileAttachment
+from app.models.issues import Issue
+
+
+def attachment_dict(attachment: FileAttachment) -> dict:
+    return {
+        "id": attachment.id,
+        "issue_id": attachment.issue_id,
+        "filename": attachment.filename,
+        "filepath": attachment.filepath,
+        "url": f"/issues/{attachment.issue_id}/attachments/{attachment.id}",
+    }
+
+
+def issue_dict(issue: Issue) -> dict:
+    """
+    The JSON form of IssueRead for an ORM issue, built directly from its
+    attributes. Rows loaded from the database are already valid, so this
+    skips pydantic validation; keep it in step with IssueRead and
+    AttachmentRead (benchmarks/serialization.py checks they agree).
+    """
+    return {
+        "title": issue.title,
+        "description": issue.description,
+        "severity": issue.severity.value,
+        "id": issue.id,
+        "status": issue.status.value,
+        "created_at": issue.created_at.isoformat(),
+        "updated_at": issue.updated_at.isoformat(),
+        "reporter_id": issue.reporter_id,
+        "attachments": [attachment_dict(a) for a in issue.attachments],
+    }
@@ -1,14 +1,181 @@
+import asyncio
+import hashlib
 import os
+import tempfile
 import uuid
-from fastapi import UploadFile
+from dataclasses import dataclass
+from typing import BinaryIO
+
+import orjson
+from fastapi import HTTPException, UploadFile
+from app.core.config import settings
 
 UPLOAD_DIR = "uploads"
+CHUNK_SIZE = 1024 * 1024
+
+class UploadTooLarge(Exception):
+    """Raised when an upload exceeds the configured maximum size."""
+    def __init__(self, max_bytes: int):
+        super().__init__(f"Upload exceeds {max_bytes} bytes")
+        self.max_bytes = max_bytes
+
+@dataclass
+class StoredFile:
+    path: str
+    sha256: str
+    size: int
+    staged: str | None = None
+    # Set when this upload inserted the blob row, so its file is ours to
+    # remove if that insert is rolled back.
+    created: bool = False
+
+def _discard(path: str) -> None:
+    try:
+        os.unlink(path)
+    except FileNotFoundError:
+        pass
+
+class ContentAddressedStorage:
+    """
+    Stores each distinct file once, named by its SHA-256 and sharded into
+    two levels of hash-prefix directories (root/ab/cd/abcd...).
+    """
+    def __init__(self, root: str):
+        self.root = root
+
+    def blob_path(self, sha256: str) -> str:
+        return os.path.join(self.root, sha256[:2], sha256[2:4], sha256)
+
+    def write_stream(self, source: BinaryIO, max_bytes: int) -> StoredFile:
+        """
+        Copy `source` into a staging file chunk by chunk, hashing as it goes.
+        The blob is not visible until place() renames it into position, which
+        callers do while holding the blob row lock so garbage collection of
+        the same hash cannot interleave.
+        """
+        os.makedirs(self.root, exist_ok=True)
+        digest = hashlib.sha256()
+        size = 0
+        fd, tmp_path = tempfile.mkstemp(dir=self.root, prefix=".upload-")
+        try:
+            with os.fdopen(fd, "wb") as out:
+                while chunk := source.read(CHUNK_SIZE):
+                    size += len(chunk)
+                    if size > max_bytes:
+                        raise UploadTooLarge(max_bytes)
+                    digest.update(chunk)
+                    out.write(chunk)
+                out.flush()
+                os.fsync(out.fileno())
+        except BaseException:
+            _discard(tmp_path)
+            raise
+        sha256 = digest.hexdigest()
+        return StoredFile(path=self.blob_path(sha256), sha256=sha256, size=size, staged=tmp_path)
+
+    def place(self, stored: StoredFile) -> None:
+        """
+        Rename a staged upload into its blob path. Rewriting an existing
+        blob is harmless: the content is identical by construction.
+        """
+        if stored.staged is None:
+            return
+        os.makedirs(os.path.dirname(stored.path), exist_ok=True)
+        os.replace(stored.staged, stored.path)
+        stored.staged = None
+
+    def abandon(self, stored: StoredFile) -> None:
+        """
+        Undo place() for an upload whose transaction is rolling back. Only a
+        blob this upload created is removed; one that other attachments
+        already referenced stays. Call before the rollback releases the row lock.
+        """
+        if stored.created:
+            _discard(stored.path)
+            stored.created = False
+
+    def discard(self, stored: StoredFile) -> None:
+        """Drop a staged upload that was never placed."""
+        if stored.staged is not None:
+            _discard(stored.staged)
+            stored.staged = None
+
+    def trash(self, sha256: str) -> str | None:
+        """
+        Move a blob aside so it can be restored if the transaction that
+        orphaned it rolls back; returns the trash path, or None if missing.
+        """
+        trashed = os.path.join(self.root, f".trash-{sha256}-{uuid.uuid4().hex}")
+        try:
+            os.replace(self.blob_path(sha256), trashed)
+        except FileNotFoundError:
+            return None
+        return trashed
+
+    def restore(self, sha256: str, trashed: str | None) -> None:
+        if trashed is not None:
+            os.replace(trashed, self.blob_path(sha256))
+
+    def purge(self, trashed: str | None) -> None:
+        if trashed is not None:
+            _discard(trashed)
+
+attachment_store = ContentAddressedStorage(UPLOAD_DIR)
+
+async def save_upload_file(file: UploadFile, max_bytes: int | None = None) -> StoredFile:
+    """Stage an upload in the attachment store on a worker thread; raises UploadTooLarge."""
+    await file.seek(0)
+    return await asyncio.to_thread(
+        attachment_store.write_stream, file.file, max_bytes or settings.MAX_UPLOAD_BYTES
+    )
+
+
+class UploadSizeLimitMiddleware:
+    """
+    Pure ASGI middleware refusing oversized multipart bodies before they
+    are parsed. Starlette spools every uploaded file to disk while parsing,
+    so the per-file cap in save_upload_file() alone would still let a huge
+    body cost its full size in disk and I/O. A declared Content-Length over
+    the limit is rejected outright; a chunked body is cut off once it
+    passes the limit.
+    """
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not _is_multipart(scope):
+            await self.app(scope, receive, send)
+            return
+
+        limit = settings.MAX_UPLOAD_BYTES + settings.MAX_UPLOAD_FORM_OVERHEAD_BYTES
+        declared = dict(scope["headers"]).get(b"content-length", b"")
+        if declared.isdigit() and int(declared) > limit:
+            await _send_too_large(send, limit)
+            return
+
+        received = 0
+
+        async def limited_receive():
+            nonlocal received
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > limit:
+                    # Raised inside the form parser, so the app's handlers answer it.
+                    raise HTTPException(status_code=413, detail=str(UploadTooLarge(limit)))
+            return message
+
+        await self.app(scope, limited_receive, send)
+
+def _is_multipart(scope) -> bool:
+    content_type = dict(scope["headers"]).get(b"content-type", b"")
+    return content_type.split(b";")[0].strip().lower() == b"multipart/form-data"
 
-def save_upload_file(file: UploadFile) -> str:
-    os.makedirs(UPLOAD_DIR, exist_ok=True)
-    ext = os.path.splitext(file.filename)[1]
-    unique_name = f"{uuid.uuid4().hex}{ext}"
-    destination = os.path.join(UPLOAD_DIR, unique_name)
-    with open(destination, "wb") as buffer:
-        buffer.write(file.file.read())
-    return destination  
+async def _send_too_large(send, limit: int) -> None:
+    body = orjson.dumps({"detail": str(UploadTooLarge(limit))})
+    await send({
+        "type": "http.response.start",
+        "status": 413,
+        "headers": [(b"content-type", b"application/json"), (b"content-length", str(len(body)).encode())],
+    })
+    await send({"type": "http.response.body", "body": body})
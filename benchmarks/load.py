@@ -0,0 +1,208 @@
+"""
+In-process load test of the API hot paths.
+
+Seeds a fresh database, drives each scenario through the ASGI app with
+httpx (no network, no server), and prints JSON with throughput and
+p50/p95/p99 latency per scenario, for comparing runs:
+
+    python -m benchmarks.load --issues 20000 --requests 500 --concurrency 16 > before.json
+
+The database defaults to a throwaway SQLite file; pass --database-url to
+run against Postgres (use an empty database). Settings come from the
+environment as usual, so e.g. BCRYPT_ROUNDS applies to the login scenario.
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import sys
+import tempfile
+import time
+
+
+def percentile(ordered: list[float], pct: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    if not ordered:
+        return 0.0
+    rank = max(1, -(-len(ordered) * pct // 100))
+    return ordered[int(rank) - 1]
+
+
+def summarize(latencies: list[float], errors: int, elapsed: float) -> dict:
+    ordered = sorted(latencies)
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        "seconds": round(elapsed, 4),
+        "throughput_rps": round(len(latencies) / elapsed, 2) if elapsed else 0.0,
+        "p50_ms": round(percentile(ordered, 50) * 1000, 3),
+        "p95_ms": round(percentile(ordered, 95) * 1000, 3),
+        "p99_ms": round(percentile(ordered, 99) * 1000, 3),
+        "max_ms": round(ordered[-1] * 1000, 3) if ordered else 0.0,
+    }
+
+
+async def run_scenario(make_request, total: int, concurrency: int) -> dict:
+    """Issue `total` requests from `concurrency` workers; a request counts as an error on any 4xx/5xx."""
+    latencies: list[float] = []
+    errors = 0
+    remaining = iter(range(total))
+
+    async def worker():
+        nonlocal errors
+        for n in remaining:
+            start = time.perf_counter()
+            response = await make_request(n)
+            latencies.append(time.perf_counter() - start)
+            errors += response.status_code >= 400
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return summarize(latencies, errors, time.perf_counter() - start)
+
+
+async def sse_fanout(subscribers: int, events: int) -> dict:
+    """
+    Publish `events` through the shared PubSub to `subscribers` live
+    subscriptions and time each delivery, formatting it as the SSE endpoint
+    would. The in-process HTTP transport buffers whole responses, so the
+    stream is driven at the PubSub level rather than through /events.
+    """
+    from app.api.events import format_event
+    from app.utils import pubsub_instance
+
+    subs = [await pubsub_instance.subscribe() for _ in range(subscribers)]
+    latencies: list[float] = []
+
+    async def consume(sub):
+        for _ in range(events):
+            msg = await sub.get()
+            format_event(msg)
+            latencies.append(time.perf_counter() - msg["sent_at"])
+
+    consumers = [asyncio.create_task(consume(sub)) for sub in subs]
+    start = time.perf_counter()
+    for n in range(events):
+        await pubsub_instance.publish({"type": "benchmark", "n": n, "sent_at": time.perf_counter()})
+        await asyncio.sleep(0)
+    await asyncio.gather(*consumers)
+    elapsed = time.perf_counter() - start
+    for sub in subs:
+        await pubsub_instance.unsubscribe(sub)
+
+    result = summarize(latencies, 0, elapsed)
+    result["subscribers"] = subscribers
+    result["events"] = events
+    return result
+
+
+async def run(args) -> dict:
+    import httpx
+
+    from app.core.config import settings
+    from app.core.security import JWTAuth
+    from app.main import app
+    from app.models.user import RoleEnum
+    from benchmarks.seed import PASSWORD, seed
+
+    rng = random.Random(args.seed)
+    seed_start = time.perf_counter()
+    seeded = seed(args.users, args.issues, args.attachments, rng)
+    seed_seconds = time.perf_counter() - seed_start
+
+    def auth(role: RoleEnum) -> dict:
+        user_id, _ = seeded.users[role][0]
+        return {"Authorization": f"Bearer {JWTAuth.create_token(user_id, role.value)}"}
+
+    reporter, maintainer = auth(RoleEnum.REPORTER), auth(RoleEnum.MAINTAINER)
+    admin = auth(RoleEnum.ADMIN)
+    emails = [email for users in seeded.users.values() for _, email in users]
+    upload = rng.randbytes(args.upload_bytes)
+    statuses = ["OPEN", "TRIAGED", "IN_PROGRESS", "DONE"]
+    filters = [{}, {"status": "OPEN"}, {"severity": "HIGH"}, {"status": "DONE", "severity": "LOW"}]
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        scenarios = {
+            "login": lambda n: client.post(
+                "/auth/login", data={"username": rng.choice(emails), "password": PASSWORD}
+            ),
+            "list": lambda n: client.get(
+                "/issues/", params={"limit": 50, **filters[n % len(filters)]}, headers=admin
+            ),
+            "get": lambda n: client.get(f"/issues/{rng.choice(seeded.issue_ids)}", headers=admin),
+            "create": lambda n: client.post(
+                "/issues/", data={"title": f"bench {n}", "description": "created by benchmark"}, headers=reporter
+            ),
+            "status_patch": lambda n: client.patch(
+                f"/issues/{rng.choice(seeded.issue_ids)}/status", json={"status": statuses[n % 4]}, headers=maintainer
+            ),
+            "upload": lambda n: client.post(
+                "/issues/",
+                data={"title": f"upload {n}", "description": "attachment benchmark"},
+                files={"file": (f"bench{n}.bin", upload, "application/octet-stream")},
+                headers=reporter,
+            ),
+        }
+        selected = args.scenarios or [*scenarios, "sse_fanout"]
+        results = {}
+        for name in selected:
+            if name == "sse_fanout":
+                results[name] = await sse_fanout(args.subscribers, args.events)
+                continue
+            total = args.login_requests if name == "login" else args.requests
+            results[name] = await run_scenario(scenarios[name], total, args.concurrency)
+
+    return {
+        "config": {**vars(args), "database": settings.SQLALCHEMY_DATABASE_URL.split("://")[0]},
+        "environment": {"python": platform.python_version(), "platform": platform.platform()},
+        "seed_seconds": round(seed_seconds, 3),
+        "scenarios": results,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--database-url", help="Empty database to seed (default: temporary SQLite file)")
+    parser.add_argument("--users", type=int, default=50)
+    parser.add_argument("--issues", type=int, default=10000)
+    parser.add_argument("--attachments", type=int, default=200)
+    parser.add_argument("--requests", type=int, default=500, help="Requests per scenario")
+    parser.add_argument("--login-requests", type=int, default=50, help="Requests for the bcrypt-bound login scenario")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--subscribers", type=int, default=100, help="SSE fan-out subscribers")
+    parser.add_argument("--events", type=int, default=200, help="SSE fan-out events")
+    parser.add_argument("--upload-bytes", type=int, default=256 * 1024)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--scenarios", nargs="*", choices=["login", "list", "get", "create", "status_patch", "upload", "sse_fanout"])
+    parser.add_argument("--output", help="Write the JSON report here instead of stdout")
+    args = parser.parse_args()
+
+    # Settings and engines are read at import time, and uploads go to a
+    # relative directory, so point both at a scratch location before
+    # importing anything from app.
+    workdir = tempfile.mkdtemp(prefix="issue-bench-")
+    database_url = args.database_url or f"sqlite:///{os.path.join(workdir, 'bench.db')}"
+    os.environ["SQLALCHEMY_DATABASE_URL"] = database_url
+    os.environ.setdefault("PASSWORD_HASH_QUEUE_DEPTH", str(max(32, args.concurrency)))
+    # Every request comes from one client and a handful of users, so the
+    # rate limits would otherwise turn most scenarios into 429s.
+    os.environ.setdefault("RATE_LIMIT_ENABLED", "false")
+    output = os.path.abspath(args.output) if args.output else None
+    os.chdir(workdir)
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+    report = asyncio.run(run(args))
+    report["config"]["database_url"] = None
+    text = json.dumps(report, indent=2)
+    if output:
+        with open(output, "w") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+
+
+if __name__ == "__main__":
+    main()
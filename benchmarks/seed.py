@@ -0,0 +1,77 @@
+"""
+Deterministic seed data for the benchmarks. Works against any database the
+app supports: rows go in through SQLAlchemy Core and the app's own
+repositories, so nothing here is dialect-specific.
+"""
+import io
+import random
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+
+from sqlalchemy import insert
+
+from app.core.security import PasswordHasher
+from app.cli import create_schema
+from app.crud.attachment import AttachmentRepository
+from app.database.session import SessionLocal
+from app.models.issues import Issue, SeverityEnum, StatusEnum
+from app.models.user import RoleEnum, User
+from app.utils.aggregator import reconcile_issue_counts
+from app.utils.storage import attachment_store
+
+PASSWORD = "benchmark-password"
+WORDS = "crash login timeout export upload latency cache report error network page slow".split()
+
+
+@dataclass
+class Seeded:
+    users: dict[RoleEnum, list[tuple[int, str]]] = field(default_factory=dict)
+    issue_ids: list[int] = field(default_factory=list)
+
+
+def seed(users: int, issues: int, attachments: int, rng: random.Random, batch: int = 1000) -> Seeded:
+    """Create the schema and fill it; returns the ids the scenarios draw from."""
+    create_schema()
+    seeded = Seeded()
+    # One hash for everyone: seeding should not spend minutes in bcrypt.
+    hashed = PasswordHasher.hash(PASSWORD)
+    roles = [RoleEnum.ADMIN, RoleEnum.MAINTAINER] + [RoleEnum.REPORTER] * max(users - 2, 1)
+
+    db = SessionLocal()
+    try:
+        for i, role in enumerate(roles):
+            user = User(email=f"bench{i}@example.com", hashed_password=hashed, role=role)
+            db.add(user)
+            db.flush()
+            seeded.users.setdefault(role, []).append((user.id, user.email))
+        db.commit()
+
+        reporters = [user_id for user_id, _ in seeded.users[RoleEnum.REPORTER]]
+        start = datetime.now() - timedelta(days=365)
+        for offset in range(0, issues, batch):
+            rows = []
+            for n in range(offset, min(offset + batch, issues)):
+                created = start + timedelta(seconds=rng.randrange(365 * 86400))
+                rows.append({
+                    "title": " ".join(rng.choices(WORDS, k=5)),
+                    "description": " ".join(rng.choices(WORDS, k=60)),
+                    "severity": rng.choice(list(SeverityEnum)),
+                    "status": rng.choice(list(StatusEnum)),
+                    "reporter_id": rng.choice(reporters),
+                    "created_at": created,
+                    "updated_at": created,
+                })
+            db.execute(insert(Issue), rows)
+            db.commit()
+        seeded.issue_ids = list(db.scalars(Issue.__table__.select().with_only_columns(Issue.id)))
+
+        repo = AttachmentRepository(db)
+        for issue_id in rng.sample(seeded.issue_ids, min(attachments, len(seeded.issue_ids))):
+            payload = rng.randbytes(rng.randrange(1024, 64 * 1024))
+            stored = attachment_store.write_stream(io.BytesIO(payload), len(payload))
+            repo.create_issue_with_attachment(issue_id=issue_id, filename="trace.log", stored=stored)
+    finally:
+        db.close()
+
+    reconcile_issue_counts()
+    return seeded
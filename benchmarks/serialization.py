@@ -0,0 +1,71 @@
+"""
+Compare the pydantic path for issue responses (validate, dump, then let
+FastAPI encode) against issue_dict + orjson.
+
+    python -m benchmarks.serialization [--issues 200] [--attachments 2] [--repeat 50]
+"""
+import argparse
+import json
+import timeit
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+import orjson
+
+from app.models.issues import SeverityEnum, StatusEnum
+from app.schemas.issues import IssuePage, IssueRead
+from app.utils.serialization import issue_dict
+
+
+def fake_issues(count: int, attachments: int) -> list[SimpleNamespace]:
+    now = datetime.now()
+    return [
+        SimpleNamespace(
+            id=i,
+            title=f"Issue {i}",
+            description="Steps to reproduce:\n" + "lorem ipsum " * 40,
+            severity=list(SeverityEnum)[i % 3],
+            status=list(StatusEnum)[i % 4],
+            created_at=now - timedelta(minutes=i),
+            updated_at=now,
+            reporter_id=i % 17 + 1,
+            attachments=[
+                SimpleNamespace(id=i * 10 + a, issue_id=i, filename=f"log{a}.txt", filepath=f"uploads/ab/{i}{a}")
+                for a in range(attachments)
+            ],
+        )
+        for i in range(1, count + 1)
+    ]
+
+
+def pydantic_path(issues) -> bytes:
+    page = IssuePage.model_validate({"items": issues, "next_cursor": None}, from_attributes=True)
+    return json.dumps(page.model_dump(mode="json")).encode()
+
+
+def fast_path(issues) -> bytes:
+    return orjson.dumps({"items": [issue_dict(issue) for issue in issues], "next_cursor": None})
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--issues", type=int, default=200)
+    parser.add_argument("--attachments", type=int, default=2)
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    issues = fake_issues(args.issues, args.attachments)
+    for issue in issues[:5]:
+        assert issue_dict(issue) == IssueRead.model_validate(issue).model_dump(mode="json"), "issue_dict drifted from IssueRead"
+    assert json.loads(fast_path(issues)) == json.loads(pydantic_path(issues))
+
+    results = {}
+    for name, fn in (("pydantic", pydantic_path), ("issue_dict+orjson", fast_path)):
+        best = min(timeit.repeat(lambda: fn(issues), number=args.repeat, repeat=5)) / args.repeat
+        results[name] = best
+        print(f"{name:>18}: {best * 1000:8.3f} ms per {args.issues}-issue page")
+    print(f"{'speedup':>18}: {results['pydantic'] / results['issue_dict+orjson']:8.2f}x")
+
+
+if __name__ == "__main__":
+    main()
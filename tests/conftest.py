@@ -0,0 +1,90 @@
+import contextlib
+import os
+import tempfile
+
+# Settings are read at import time, so point the app at a throwaway SQLite
+# database (and upload directory) before anything from app is imported.
+_workdir = tempfile.mkdtemp(prefix="issue-tracker-tests-")
+os.chdir(_workdir)
+os.environ.setdefault("SQLALCHEMY_DATABASE_URL", f"sqlite:///{_workdir}/test.db")
+os.environ.setdefault("SECRET_KEY", "test-secret")
+os.environ.setdefault("ADMIN_EMAIL", "admin@example.com")
+os.environ.setdefault("ADMIN_PASSWORD", "admin-password")
+os.environ.setdefault("BCRYPT_ROUNDS", "4")
+# The suite creates far more issues than one admin's write burst allows, and
+# every request comes from the same test client address.
+os.environ.setdefault("ISSUE_WRITE_BURST", "100000")
+os.environ.setdefault("LOGIN_IP_BURST", "100000")
+os.environ.setdefault("REGISTER_IP_BURST", "100000")
+
+import pytest  # noqa: E402
+from fastapi.testclient import TestClient  # noqa: E402
+from sqlalchemy import event  # noqa: E402
+
+from app.cli import create_schema, ensure_admin  # noqa: E402
+from app.core.config import settings  # noqa: E402
+from app.database.session import get_async_engine  # noqa: E402
+
+
+@pytest.fixture(scope="session")
+def client():
+    create_schema()
+    ensure_admin()
+    from app.main import app
+    with TestClient(app) as client:
+        yield client
+
+
+def login(client, email: str, password: str) -> dict:
+    response = client.post("/auth/login", data={"username": email, "password": password})
+    assert response.status_code == 200, response.text
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+
+@pytest.fixture(scope="session")
+def admin_headers(client):
+    return login(client, settings.ADMIN_EMAIL, settings.ADMIN_PASSWORD)
+
+
+@pytest.fixture(scope="session")
+def admin_id(client, admin_headers):
+    return client.get("/auth/me", headers=admin_headers).json()["id"]
+
+
+@pytest.fixture
+def create_issue(client):
+    """POST an issue through the API and return the 201 response."""
+    def create(headers: dict, title: str = "An issue", **kwargs):
+        response = client.post(
+            "/issues/", data={"title": title, "description": "Steps to reproduce"}, headers=headers, **kwargs
+        )
+        assert response.status_code == 201, response.text
+        return response
+    return create
+
+
+class QueryCounter:
+    def __init__(self):
+        self.statements: list[str] = []
+
+    @property
+    def count(self) -> int:
+        return len(self.statements)
+
+    def __call__(self, conn, cursor, statement, parameters, context, executemany):
+        self.statements.append(statement)
+
+
+@pytest.fixture
+def count_queries():
+    """Context manager recording every SQL statement the API's async engine runs."""
+    @contextlib.contextmanager
+    def counting():
+        counter = QueryCounter()
+        engine = get_async_engine().sync_engine
+        event.listen(engine, "before_cursor_execute", counter)
+        try:
+            yield counter
+        finally:
+            event.remove(engine, "before_cursor_execute", counter)
+    return counting
@@ -0,0 +1,86 @@
+import hashlib
+import os
+import uuid
+
+import pytest
+
+from app.database.session import SessionLocal
+from app.models.attachment import AttachmentBlob
+from app.utils.storage import attachment_store
+
+
+def ref_count(sha256: str) -> int | None:
+    db = SessionLocal()
+    try:
+        blob = db.get(AttachmentBlob, sha256)
+        return blob and blob.ref_count
+    finally:
+        db.close()
+
+
+def test_identical_uploads_share_one_blob_until_the_last_delete(client, admin_headers, create_issue):
+    content = f"shared {uuid.uuid4()}".encode()
+    upload = {"file": ("shared.txt", content, "text/plain")}
+    first = create_issue(admin_headers, files=upload).json()
+    second = create_issue(admin_headers, files=upload).json()
+    sha256 = hashlib.sha256(content).hexdigest()
+    path = attachment_store.blob_path(sha256)
+    assert ref_count(sha256) == 2
+
+    assert client.delete(f"/issues/{first['id']}", headers=admin_headers).status_code == 204
+    assert ref_count(sha256) == 1
+    assert os.path.exists(path)
+
+    assert client.delete(f"/issues/{second['id']}", headers=admin_headers).status_code == 204
+    assert ref_count(sha256) is None
+    assert not os.path.exists(path)
+
+
+def test_download_returns_the_stored_content(client, admin_headers, create_issue):
+    content = uuid.uuid4().bytes
+    issue = create_issue(admin_headers, files={"file": ("blob.bin", content, "application/octet-stream")}).json()
+    response = client.get(issue["attachments"][0]["url"], headers=admin_headers)
+    assert response.status_code == 200
+    assert response.content == content
+
+
+def fail_completion(monkeypatch):
+    from app.crud.idempotency import AsyncIdempotencyRepository
+
+    async def fail(*args, **kwargs):
+        raise RuntimeError("storage hiccup")
+    monkeypatch.setattr(AsyncIdempotencyRepository, "complete", fail)
+
+
+def test_rolled_back_upload_leaves_no_file(client, admin_headers, monkeypatch):
+    content = f"rolled back {uuid.uuid4()}".encode()
+    sha256 = hashlib.sha256(content).hexdigest()
+    fail_completion(monkeypatch)
+
+    with pytest.raises(RuntimeError):
+        client.post(
+            "/issues/",
+            data={"title": "rolled back", "description": "d"},
+            files={"file": ("a.txt", content, "text/plain")},
+            headers={**admin_headers, "Idempotency-Key": uuid.uuid4().hex},
+        )
+    assert ref_count(sha256) is None
+    assert not os.path.exists(attachment_store.blob_path(sha256))
+    assert not [name for name in os.listdir(attachment_store.root) if name.startswith(".upload-")]
+
+
+def test_rolled_back_upload_keeps_a_shared_file(client, admin_headers, create_issue, monkeypatch):
+    content = f"kept {uuid.uuid4()}".encode()
+    sha256 = hashlib.sha256(content).hexdigest()
+    create_issue(admin_headers, files={"file": ("a.txt", content, "text/plain")})
+    fail_completion(monkeypatch)
+
+    with pytest.raises(RuntimeError):
+        client.post(
+            "/issues/",
+            data={"title": "rolled back", "description": "d"},
+            files={"file": ("a.txt", content, "text/plain")},
+            headers={**admin_headers, "Idempotency-Key": uuid.uuid4().hex},
+        )
+    assert ref_count(sha256) == 1
+    assert os.path.exists(attachment_store.blob_path(sha256))
@@ -0,0 +1,89 @@
+import uuid
+
+NDJSON = {"Content-Type": "application/x-ndjson"}
+
+
+def titles(client, headers) -> list[str]:
+    return [i["title"] for i in client.get("/issues/", params={"limit": 200}, headers=headers).json()["items"]]
+
+
+def test_json_array_import(client, admin_headers):
+    tag = uuid.uuid4().hex
+    response = client.post(
+        "/issues/bulk",
+        json=[{"title": f"{tag}-{n}", "description": "imported", "severity": "HIGH"} for n in range(3)],
+        headers=admin_headers,
+    )
+    assert response.status_code == 201
+    assert response.json() == {"count": 3}
+    assert sum(t.startswith(tag) for t in titles(client, admin_headers)) == 3
+
+
+def test_ndjson_import_skips_blank_lines(client, admin_headers):
+    body = b'{"title":"nd1","description":"d"}\n\n{"title":"nd2","description":"d"}'
+    response = client.post("/issues/bulk", content=body, headers={**admin_headers, **NDJSON})
+    assert response.json() == {"count": 2}
+
+
+def test_json_seq_records_are_accepted(client, admin_headers):
+    body = b'\x1e{"title":"seq1","description":"d"}\n\x1e{"title":"seq2","description":"d"}\n'
+    response = client.post(
+        "/issues/bulk", content=body, headers={**admin_headers, "Content-Type": "application/json-seq"}
+    )
+    assert response.status_code == 201, response.text
+    assert response.json() == {"count": 2}
+
+
+def test_malformed_line_is_a_422(client, admin_headers):
+    body = b'{"title":"b1","description":"d"}\n{"title": oops}\n'
+    response = client.post("/issues/bulk", content=body, headers={**admin_headers, **NDJSON})
+    assert response.status_code == 422
+    detail = response.json()["detail"]
+    assert detail["item"] == 2
+    assert detail["errors"][0]["type"] == "json_invalid"
+
+
+def test_missing_field_is_a_422(client, admin_headers):
+    response = client.post("/issues/bulk", json=[{"title": "no description"}], headers=admin_headers)
+    assert response.status_code == 422
+    detail = response.json()["detail"]
+    assert detail["item"] == 1
+    assert detail["errors"][0]["loc"] == ["description"]
+    assert "input" not in detail["errors"][0]
+
+
+def test_failed_import_reports_committed_chunks(client, admin_headers, monkeypatch):
+    from app.core.config import settings
+    monkeypatch.setattr(settings, "BULK_CHUNK_SIZE", 2)
+    tag = uuid.uuid4().hex
+    lines = [f'{{"title":"{tag}-{n}","description":"d"}}'.encode() for n in range(3)]
+    body = b"\n".join([*lines, b'{"title":"bad"}'])
+
+    response = client.post("/issues/bulk", content=body, headers={**admin_headers, **NDJSON})
+    assert response.status_code == 422
+    assert response.json()["detail"]["created"] == 2
+    # The first chunk stays committed; the pending one is discarded.
+    assert sum(t.startswith(tag) for t in titles(client, admin_headers)) == 2
+
+
+def test_unsupported_media_type(client, admin_headers):
+    response = client.post("/issues/bulk", content=b"x", headers={**admin_headers, "Content-Type": "text/plain"})
+    assert response.status_code == 415
+
+
+def test_bulk_status_by_ids_and_by_filter(client, admin_headers, create_issue):
+    ids = [create_issue(admin_headers, title="bulk status").json()["id"] for _ in range(2)]
+    response = client.patch("/issues/status", json={"status": "TRIAGED", "ids": ids}, headers=admin_headers)
+    assert response.json() == {"count": 2}
+    assert {client.get(f"/issues/{i}", headers=admin_headers).json()["status"] for i in ids} == {"TRIAGED"}
+
+    response = client.patch(
+        "/issues/status", json={"status": "DONE", "filter": {"status": "TRIAGED"}}, headers=admin_headers
+    )
+    assert response.json()["count"] >= 2
+    assert {client.get(f"/issues/{i}", headers=admin_headers).json()["status"] for i in ids} == {"DONE"}
+
+
+def test_bulk_status_needs_exactly_one_target(client, admin_headers):
+    response = client.patch("/issues/status", json={"status": "DONE"}, headers=admin_headers)
+    assert response.status_code == 422
@@ -0,0 +1,43 @@
+from sqlalchemy import create_engine, inspect
+
+from app.cli import upgrade_tables
+from app.database.base_class import Base
+
+# Tables as the first release created them, before content hashing and
+# per-severity stats.
+LEGACY_SCHEMA = (
+    "CREATE TABLE issues (id INTEGER PRIMARY KEY, title VARCHAR(200) NOT NULL, description TEXT NOT NULL, "
+    "severity VARCHAR(8) NOT NULL, status VARCHAR(11) NOT NULL, created_at DATETIME NOT NULL, "
+    "updated_at DATETIME NOT NULL, reporter_id INTEGER NOT NULL)",
+    "CREATE TABLE file_attachments (id INTEGER PRIMARY KEY, issue_id INTEGER NOT NULL, "
+    "filename VARCHAR NOT NULL, filepath VARCHAR NOT NULL)",
+    "CREATE TABLE daily_stats (id INTEGER PRIMARY KEY, timestamp DATETIME NOT NULL, "
+    "status VARCHAR(11) NOT NULL, count INTEGER NOT NULL)",
+)
+
+
+def test_upgrade_adds_missing_columns_and_indexes(client, tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path}/legacy.db")
+    with engine.begin() as connection:
+        for statement in LEGACY_SCHEMA:
+            connection.exec_driver_sql(statement)
+        connection.exec_driver_sql(
+            "INSERT INTO file_attachments (issue_id, filename, filepath) VALUES (1, 'a.txt', 'uploads/a.txt')"
+        )
+        changes = upgrade_tables(connection, Base.metadata)
+
+    assert "added column file_attachments.content_hash" in changes
+    assert "added column file_attachments.size" in changes
+    assert "added column daily_stats.severity" in changes
+    assert "added index ix_issues_created_at_id" in changes
+    # Postgres-only indexes are not attempted on SQLite.
+    assert not any("ix_issues_search" in change for change in changes)
+
+    inspector = inspect(engine)
+    assert {"content_hash", "size"} <= {c["name"] for c in inspector.get_columns("file_attachments")}
+    assert "ix_daily_stats_timestamp" in {i["name"] for i in inspector.get_indexes("daily_stats")}
+    with engine.connect() as connection:
+        assert connection.exec_driver_sql("SELECT content_hash FROM file_attachments").scalar() is None
+
+    with engine.begin() as connection:
+        assert upgrade_tables(connection, Base.metadata) == []
@@ -0,0 +1,87 @@
+import asyncio
+import json
+
+from app.api.events import event_filter, events, format_event
+from app.schemas.issues import SeverityEnum
+from app.utils.pubsub import PubSub
+
+
+def published(*messages: dict) -> PubSub:
+    pubsub = PubSub(replay_size=3)
+
+    async def publish():
+        for message in messages:
+            await pubsub.publish(message)
+    asyncio.run(publish())
+    return pubsub
+
+
+def test_replay_returns_what_followed_the_last_seen_event():
+    pubsub = published({"type": "a"}, {"type": "b"}, {"type": "c"})
+    first = pubsub.history[0]["event_id"]
+    backlog, complete = pubsub.replay(first)
+    assert [m["type"] for m in backlog] == ["b", "c"]
+    assert complete
+
+
+def test_replay_follows_delivery_order_not_id_order():
+    pubsub = PubSub()
+    # Another worker's clock ran behind: ids arrive out of order.
+    for event_id, kind in ((100, "a"), (90, "b"), (110, "c")):
+        pubsub._dispatch({"type": kind, "event_id": event_id})
+    backlog, complete = pubsub.replay(100)
+    assert [m["type"] for m in backlog] == ["b", "c"]
+    assert complete
+
+
+def test_replay_past_the_buffer_reports_a_gap():
+    pubsub = published(*({"type": str(n)} for n in range(5)))
+    backlog, complete = pubsub.replay(1)
+    assert not complete
+    assert [m["type"] for m in backlog] == ["2", "3", "4"]
+
+
+def test_format_event_with_and_without_id():
+    assert format_event({"type": "a", "event_id": 7}) == 'id: 7\ndata: {"type": "a", "event_id": 7}\n\n'
+    assert format_event({"type": "a"}) == 'data: {"type": "a"}\n\n'
+
+
+def test_event_filter():
+    matches = event_filter(["issue_updated", "issue_deleted"], [SeverityEnum.HIGH])
+    assert matches({"type": "issue_updated", "issue": {"severity": "HIGH"}})
+    assert not matches({"type": "issue_updated", "issue": {"severity": "LOW"}})
+    assert not matches({"type": "issue_created", "issue": {"severity": "HIGH"}})
+    # Deletions carry no issue body and pass the severity filter.
+    assert matches({"type": "issue_deleted", "issue_id": 1})
+
+
+def first_frames(last_event_id: str, count: int) -> list[str]:
+    async def read():
+        response = await events(event_type=None, severity=None, last_event_id=last_event_id)
+        frames = []
+        async for frame in response.body_iterator:
+            frames.append(frame)
+            if len(frames) == count:
+                break
+        await response.body_iterator.aclose()
+        return frames
+
+    return asyncio.run(read())
+
+
+def test_stream_replays_missed_events(client, admin_headers, create_issue):
+    from app.utils import pubsub_instance
+    create_issue(admin_headers)
+    last_seen = pubsub_instance.history[-1]["event_id"]
+    issue = create_issue(admin_headers, title="missed").json()
+
+    (frame,) = first_frames(str(last_seen), 1)
+    event_id, data = frame.splitlines()[:2]
+    assert event_id == f"id: {pubsub_instance.history[-1]['event_id']}"
+    assert json.loads(data.removeprefix("data: "))["issue"]["id"] == issue["id"]
+
+
+def test_stream_announces_a_replay_gap(client, admin_headers, create_issue):
+    create_issue(admin_headers)
+    frame = first_frames("1", 1)[0]
+    assert json.loads(frame.removeprefix("data: ")) == {"type": "replay_gap"}
@@ -0,0 +1,60 @@
+import csv
+import io
+import json
+import uuid
+
+from tests.conftest import login
+
+
+def register(client) -> tuple[int, dict]:
+    email = f"{uuid.uuid4().hex}@example.com"
+    response = client.post("/auth/register", json={"email": email, "password": "reporter-password"})
+    assert response.status_code == 200, response.text
+    return response.json()["id"], login(client, email, "reporter-password")
+
+
+def test_ndjson_export_streams_reporters_own_issues(client, admin_headers, create_issue):
+    reporter_id, headers = register(client)
+    ids = [create_issue(headers, title=f"Export {n}").json()["id"] for n in range(3)]
+    create_issue(admin_headers, title="Someone else's")
+
+    response = client.get("/issues/export", headers=headers)
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    rows = [json.loads(line) for line in response.text.splitlines()]
+    assert [row["id"] for row in rows] == ids
+    assert {row["reporter_id"] for row in rows} == {reporter_id}
+    assert rows[0]["title"] == "Export 0"
+    assert rows[0]["status"] == "OPEN"
+
+
+def test_csv_export_has_header_and_honours_filters(client, admin_headers, create_issue):
+    reporter_id, headers = register(client)
+    create_issue(headers, title="Low")
+    response = client.post(
+        "/issues/", data={"title": "High, \"quoted\"", "description": "x", "severity": "HIGH"}, headers=headers
+    )
+    assert response.status_code == 201
+    high_id = response.json()["id"]
+
+    response = client.get(
+        "/issues/export",
+        params={"format": "csv", "severity": "HIGH", "reporter_id": reporter_id},
+        headers=admin_headers,
+    )
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/csv")
+    rows = list(csv.DictReader(io.StringIO(response.text)))
+    assert [(int(row["id"]), row["title"], row["severity"]) for row in rows] == [
+        (high_id, "High, \"quoted\"", "HIGH")
+    ]
+
+
+def test_empty_csv_export_still_has_header(client):
+    _, headers = register(client)
+    response = client.get("/issues/export", params={"format": "csv"}, headers=headers)
+    assert response.text.splitlines() == [
+        "id,title,description,severity,status,reporter_id,created_at,updated_at"
+    ]
@@ -0,0 +1,32 @@
+def test_list_etag_revalidates_until_the_collection_changes(client, admin_headers, create_issue):
+    etag = client.get("/issues/", headers=admin_headers).headers["ETag"]
+
+    cached = client.get("/issues/", headers={**admin_headers, "If-None-Match": etag})
+    assert cached.status_code == 304
+    assert cached.content == b""
+
+    create_issue(admin_headers)
+    changed = client.get("/issues/", headers={**admin_headers, "If-None-Match": etag})
+    assert changed.status_code == 200
+    assert changed.headers["ETag"] != etag
+
+
+def test_list_etag_differs_per_query(client, admin_headers):
+    everything = client.get("/issues/", headers=admin_headers).headers["ETag"]
+    filtered = client.get("/issues/", params={"severity": "HIGH"}, headers=admin_headers).headers["ETag"]
+    assert everything != filtered
+
+
+def test_detail_etag_revalidates_until_the_issue_changes(client, admin_headers, create_issue):
+    issue = create_issue(admin_headers).json()
+    first = client.get(f"/issues/{issue['id']}", headers=admin_headers)
+    etag = first.headers["ETag"]
+    assert "Last-Modified" in first.headers
+
+    cached = client.get(f"/issues/{issue['id']}", headers={**admin_headers, "If-None-Match": etag})
+    assert cached.status_code == 304
+
+    client.patch(f"/issues/{issue['id']}/status", json={"status": "TRIAGED"}, headers=admin_headers)
+    changed = client.get(f"/issues/{issue['id']}", headers={**admin_headers, "If-None-Match": etag})
+    assert changed.status_code == 200
+    assert changed.headers["ETag"] != etag
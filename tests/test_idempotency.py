@@ -0,0 +1,66 @@
+import uuid
+
+import pytest
+
+
+def issue_titles(client, headers) -> list[str]:
+    return [i["title"] for i in client.get("/issues/", params={"limit": 200}, headers=headers).json()["items"]]
+
+
+def test_retry_replays_the_first_response(client, admin_headers, create_issue):
+    headers = {**admin_headers, "Idempotency-Key": uuid.uuid4().hex}
+    upload = {"file": ("log.txt", b"first payload", "text/plain")}
+    title = f"replayed {uuid.uuid4().hex}"
+
+    first = create_issue(headers, title=title, files=upload)
+    retry = create_issue(headers, title=title, files=upload)
+    assert "Idempotent-Replayed" not in first.headers
+    assert retry.headers["Idempotent-Replayed"] == "true"
+    assert retry.json() == first.json()
+    assert issue_titles(client, admin_headers).count(title) == 1
+
+
+def test_key_reused_with_different_content_is_rejected(client, admin_headers, create_issue):
+    headers = {**admin_headers, "Idempotency-Key": uuid.uuid4().hex}
+    form = {"title": "same fields", "description": "Steps to reproduce"}
+    create_issue(headers, title=form["title"], files={"file": ("log.txt", b"one", "text/plain")})
+
+    other = client.post("/issues/", data=form, files={"file": ("log.txt", b"two", "text/plain")}, headers=headers)
+    assert other.status_code == 422
+
+
+def test_failure_part_way_leaves_nothing_to_duplicate(client, admin_headers, create_issue, monkeypatch):
+    from app.crud.idempotency import AsyncIdempotencyRepository
+    headers = {**admin_headers, "Idempotency-Key": uuid.uuid4().hex}
+    title = f"atomic {uuid.uuid4().hex}"
+    complete = AsyncIdempotencyRepository.complete
+
+    async def fail(*args, **kwargs):
+        raise RuntimeError("storage hiccup")
+    monkeypatch.setattr(AsyncIdempotencyRepository, "complete", fail)
+    with pytest.raises(RuntimeError):
+        client.post("/issues/", data={"title": title, "description": "d"}, headers=headers)
+    assert title not in issue_titles(client, admin_headers)
+
+    monkeypatch.setattr(AsyncIdempotencyRepository, "complete", complete)
+    create_issue(headers, title=title)
+    assert issue_titles(client, admin_headers).count(title) == 1
+
+
+def writes(statements: list[str]) -> list[str]:
+    return [s for s in statements if s.lstrip().split()[0].upper() in {"INSERT", "UPDATE", "DELETE"}]
+
+
+def test_collection_version_is_the_last_row_written(client, admin_headers, create_issue, count_queries):
+    headers = {**admin_headers, "Idempotency-Key": uuid.uuid4().hex}
+    upload = {"file": ("log.txt", uuid.uuid4().bytes, "application/octet-stream")}
+    client.get("/auth/me", headers=admin_headers)
+
+    with count_queries() as created:
+        issue = create_issue(headers, files=upload).json()
+    assert "issue_collection_version" in writes(created.statements)[-1]
+    assert sum("issue_collection_version" in s for s in writes(created.statements)) == 1
+
+    with count_queries() as deleted:
+        client.delete(f"/issues/{issue['id']}", headers=admin_headers)
+    assert "issue_collection_version" in writes(deleted.statements)[-1]
@@ -0,0 +1,32 @@
+import uuid
+
+from app.core.config import settings
+
+
+def test_metrics_require_authentication(client):
+    assert client.get("/metrics").status_code == 401
+
+
+def test_metrics_are_admin_only(client, admin_headers):
+    email = f"{uuid.uuid4().hex}@example.com"
+    client.post("/auth/register", json={"email": email, "password": "reporter-password"})
+    token = client.post("/auth/login", data={"username": email, "password": "reporter-password"}).json()["access_token"]
+
+    assert client.get("/metrics", headers={"Authorization": f"Bearer {token}"}).status_code == 403
+    response = client.get("/metrics", headers=admin_headers)
+    assert response.status_code == 200
+    assert "# TYPE http_request_duration_seconds histogram" in response.text
+
+
+def test_scrape_token(client, monkeypatch):
+    monkeypatch.setattr(settings, "METRICS_TOKEN", "scrape-secret")
+    assert client.get("/metrics", headers={"Authorization": "Bearer scrape-secret"}).status_code == 200
+    assert client.get("/metrics", headers={"Authorization": "Bearer wrong"}).status_code == 401
+
+
+def test_requests_are_recorded_per_route_template(client, admin_headers, create_issue):
+    issue = create_issue(admin_headers).json()
+    client.get(f"/issues/{issue['id']}", headers=admin_headers)
+    body = client.get("/metrics", headers=admin_headers).text
+    assert 'route="/issues/{issue_id}"' in body
+    assert f'route="/issues/{issue["id"]}"' not in body
@@ -0,0 +1,72 @@
+import asyncio
+import uuid
+
+from app.crud.user import AsyncUserRepository
+from app.database.session import AsyncSessionLocal
+from app.dependencies import auth
+from app.utils import pubsub_instance
+from tests.conftest import login
+
+
+def register(client) -> tuple[int, dict]:
+    email = f"{uuid.uuid4().hex}@example.com"
+    response = client.post("/auth/register", json={"email": email, "password": "reporter-password"})
+    assert response.status_code == 200, response.text
+    return response.json()["id"], login(client, email, "reporter-password")
+
+
+def test_role_change_is_visible_immediately(client, admin_headers):
+    user_id, headers = register(client)
+    assert client.get("/auth/me", headers=headers).json()["role"] == "REPORTER"
+    assert auth.principal_cache.get(user_id) is not None
+
+    response = client.patch(f"/users/{user_id}/role/MAINTAINER", headers=admin_headers)
+    assert response.status_code == 200
+    assert auth.principal_cache.get(user_id) is None
+    assert client.get("/auth/me", headers=headers).json()["role"] == "MAINTAINER"
+
+
+def test_invalidation_from_another_worker_drops_the_entry(client):
+    user_id, headers = register(client)
+    client.get("/auth/me", headers=headers)
+    assert auth.principal_cache.get(user_id) is not None
+
+    # What the broker delivers when another worker changes this user's role.
+    pubsub_instance._dispatch({"type": "principal_invalidated", "user_id": user_id, "internal": True, "event_id": 1})
+    assert auth.principal_cache.get(user_id) is None
+
+
+def test_invalidation_is_not_sent_to_event_subscribers(client):
+    user_id, _ = register(client)
+
+    async def invalidate_and_listen():
+        subscription = await pubsub_instance.subscribe()
+        try:
+            await auth.invalidate_principal(user_id)
+            return subscription.lag
+        finally:
+            await pubsub_instance.unsubscribe(subscription)
+
+    assert asyncio.run(invalidate_and_listen()) == 0
+    assert all(m.get("type") != "principal_invalidated" for m in pubsub_instance.history)
+
+
+def test_load_racing_an_invalidation_is_not_cached(client, monkeypatch):
+    user_id, headers = register(client)
+    auth.principal_cache.pop(user_id)
+    token = headers["Authorization"].removeprefix("Bearer ")
+    get = AsyncUserRepository.get
+
+    async def get_then_invalidate(self, uid):
+        user = await get(self, uid)
+        # The role changes after this request read the row.
+        auth._drop_principal(uid)
+        return user
+    monkeypatch.setattr(AsyncUserRepository, "get", get_then_invalidate)
+
+    async def load():
+        async with AsyncSessionLocal() as db:
+            return await auth.get_current_user(token, db)
+
+    assert asyncio.run(load()).id == user_id
+    assert auth.principal_cache.get(user_id) is None
@@ -0,0 +1,77 @@
+import asyncio
+
+import pytest
+
+from app.utils.pubsub import OverflowPolicy, PubSub, Subscription, SubscriptionClosed
+
+
+def updated(issue_id: int, version: int) -> dict:
+    return {"type": "issue_updated", "issue": {"id": issue_id, "version": version}}
+
+
+def created(issue_id: int) -> dict:
+    return {"type": "issue_created", "issue": {"id": issue_id}}
+
+
+def drain(sub: Subscription) -> list[dict]:
+    return list(sub._buffer)
+
+
+def test_drop_oldest():
+    sub = Subscription(2, OverflowPolicy.DROP_OLDEST)
+    for n in range(3):
+        sub.offer(updated(n, 0))
+    assert [m["issue"]["id"] for m in drain(sub)] == [1, 2]
+    assert sub.dropped == 1
+
+
+def test_disconnect_closes_the_subscription():
+    sub = Subscription(1, OverflowPolicy.DISCONNECT)
+    sub.offer(updated(1, 0))
+    sub.offer(updated(2, 0))
+    assert sub.closed
+    with pytest.raises(SubscriptionClosed):
+        asyncio.run(sub.get())
+
+
+def test_coalesce_replaces_in_place():
+    sub = Subscription(3, OverflowPolicy.COALESCE)
+    sub.offer(updated(1, 1))
+    sub.offer(updated(2, 1))
+    sub.offer({"type": "issue_status", "issue": {"id": 1}})
+    sub.offer(updated(1, 2))
+    assert drain(sub) == [updated(1, 2), updated(2, 1), {"type": "issue_status", "issue": {"id": 1}}]
+    assert sub.coalesced == 1
+    assert sub.dropped == 0
+
+
+def test_coalesce_keeps_lifecycle_events():
+    sub = Subscription(2, OverflowPolicy.COALESCE)
+    sub.offer(created(1))
+    sub.offer(updated(1, 1))
+    # Nothing to merge with: the oldest update gives way, never the creation.
+    sub.offer({"type": "issue_deleted", "issue_id": 1})
+    assert [m["type"] for m in drain(sub)] == ["issue_created", "issue_deleted"]
+    assert sub.dropped == 1
+
+
+def test_coalesce_disconnects_when_only_lifecycle_events_are_queued():
+    sub = Subscription(2, OverflowPolicy.COALESCE)
+    sub.offer(created(1))
+    sub.offer(created(2))
+    sub.offer(created(3))
+    assert sub.closed
+
+
+def test_pubsub_evicts_closed_subscribers():
+    async def run():
+        pubsub = PubSub(queue_size=1, overflow_policy=OverflowPolicy.DISCONNECT)
+        slow = await pubsub.subscribe()
+        await pubsub.publish(updated(1, 0))
+        await pubsub.publish(updated(2, 0))
+        return pubsub, slow
+
+    pubsub, slow = asyncio.run(run())
+    assert slow.closed
+    assert pubsub.subscribers == {}
+    assert pubsub.evicted == 1
@@ -0,0 +1,61 @@
+import io
+
+import pytest
+
+from app.crud.attachment import AttachmentRepository
+from app.crud.issue import IssueRepository
+from app.database.session import SessionLocal
+from app.schemas.issues import IssueCreate
+from app.utils.storage import attachment_store
+
+
+@pytest.fixture
+def make_issue(admin_id):
+    """Insert an issue with `attachments` attachments, bypassing the API's write quota."""
+    def make(attachments: int = 1) -> int:
+        db = SessionLocal()
+        try:
+            issue = IssueRepository(db).create(
+                IssueCreate(title="query count", description="n+1 guard"), reporter_id=admin_id
+            )
+            for n in range(attachments):
+                payload = f"issue {issue.id} attachment {n}".encode()
+                stored = attachment_store.write_stream(io.BytesIO(payload), len(payload))
+                AttachmentRepository(db).create_issue_with_attachment(issue.id, f"{n}.txt", stored)
+            return issue.id
+        finally:
+            db.close()
+    return make
+
+
+def test_list_query_count_does_not_grow_with_issues(client, admin_headers, make_issue, count_queries):
+    # Warm the principal cache so authentication is not part of the count.
+    client.get("/auth/me", headers=admin_headers)
+
+    make_issue()
+    with count_queries() as few:
+        response = client.get("/issues/", params={"limit": 200}, headers=admin_headers)
+    assert response.status_code == 200
+
+    for _ in range(5):
+        make_issue(attachments=2)
+    with count_queries() as many:
+        response = client.get("/issues/", params={"limit": 200}, headers=admin_headers)
+    assert response.status_code == 200
+    assert sum(len(i["attachments"]) for i in response.json()["items"]) >= 11
+
+    assert many.count == few.count, many.statements
+
+
+def test_detail_query_count_does_not_grow_with_attachments(client, admin_headers, make_issue, count_queries):
+    client.get("/auth/me", headers=admin_headers)
+
+    with count_queries() as one:
+        response = client.get(f"/issues/{make_issue(attachments=1)}", headers=admin_headers)
+    assert len(response.json()["attachments"]) == 1
+
+    with count_queries() as three:
+        response = client.get(f"/issues/{make_issue(attachments=3)}", headers=admin_headers)
+    assert len(response.json()["attachments"]) == 3
+
+    assert three.count == one.count, three.statements
@@ -0,0 +1,46 @@
+import asyncio
+import uuid
+
+from app.core.config import settings
+from app.database.session import AsyncSessionLocal
+from app.utils.ratelimit import DatabaseBucketStore, MemoryBucketStore
+
+
+def test_login_attempts_for_one_account_are_throttled(client):
+    email = f"{uuid.uuid4().hex}@example.com"
+    for _ in range(settings.LOGIN_ACCOUNT_BURST):
+        response = client.post("/auth/login", data={"username": email, "password": "wrong"})
+        assert response.status_code != 429
+
+    throttled = client.post("/auth/login", data={"username": email, "password": "wrong"})
+    assert throttled.status_code == 429
+    assert int(throttled.headers["Retry-After"]) >= 1
+
+
+def test_memory_bucket_spends_burst_then_reports_wait():
+    store = MemoryBucketStore(max_keys=10)
+    assert [asyncio.run(store.take("k", rate=1.0, burst=2)) for _ in range(2)] == [0.0, 0.0]
+    wait = asyncio.run(store.take("k", rate=1.0, burst=2))
+    assert 0 < wait <= 1.0
+
+
+def test_memory_bucket_evicts_least_recently_used_key():
+    store = MemoryBucketStore(max_keys=1)
+    asyncio.run(store.take("a", rate=0.001, burst=1))
+    asyncio.run(store.take("b", rate=0.001, burst=1))
+    # "a" was evicted, so it starts full again.
+    assert asyncio.run(store.take("a", rate=0.001, burst=1)) == 0.0
+
+
+def test_database_buckets_are_shared_between_stores(client):
+    key = f"test:{uuid.uuid4().hex}"
+    first, second = DatabaseBucketStore(AsyncSessionLocal), DatabaseBucketStore(AsyncSessionLocal)
+
+    async def spend():
+        return [
+            await first.take(key, rate=0.001, burst=1),
+            await second.take(key, rate=0.001, burst=1),
+        ]
+    granted, refused = asyncio.run(spend())
+    assert granted == 0.0
+    assert refused > 0
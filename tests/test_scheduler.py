@@ -0,0 +1,76 @@
+import threading
+import time
+import uuid
+from datetime import datetime, timedelta
+
+from app.database.session import SessionLocal
+from app.models.scheduler_lease import SchedulerLease
+from app.utils import scheduler
+
+
+def lease(name: str) -> SchedulerLease:
+    db = SessionLocal()
+    try:
+        return db.get(SchedulerLease, name)
+    finally:
+        db.close()
+
+
+def test_lease_is_exclusive_until_it_expires(client):
+    name = f"job-{uuid.uuid4().hex[:8]}"
+    assert scheduler.acquire_lease(name, timedelta(seconds=60))
+    assert not scheduler.acquire_lease(name, timedelta(seconds=60))
+
+    db = SessionLocal()
+    try:
+        db.get(SchedulerLease, name).expires_at = datetime.utcnow() - timedelta(seconds=1)
+        db.commit()
+    finally:
+        db.close()
+    assert scheduler.acquire_lease(name, timedelta(seconds=60))
+
+
+def test_run_exclusive_records_outcome(client):
+    name = f"job-{uuid.uuid4().hex[:8]}"
+    scheduler.run_exclusive(name, timedelta(minutes=1), lambda: None)()
+    scheduler.run_exclusive(name, timedelta(minutes=1), lambda: None)()
+
+    stats = scheduler.job_stats[name]
+    assert (stats.runs, stats.skipped, stats.last_outcome) == (1, 1, "success")
+    assert lease(name).last_outcome == "success"
+    # Held for the rest of the interval so no worker repeats this tick.
+    assert lease(name).expires_at > datetime.utcnow()
+
+
+def test_failure_is_recorded(client):
+    name = f"job-{uuid.uuid4().hex[:8]}"
+
+    def fail():
+        raise RuntimeError("boom")
+    scheduler.run_exclusive(name, timedelta(minutes=1), fail)()
+    assert scheduler.job_stats[name].failures == 1
+    assert lease(name).last_outcome == "failure"
+
+
+def test_lease_is_renewed_while_the_job_runs(client):
+    name = f"job-{uuid.uuid4().hex[:8]}"
+    interval = timedelta(seconds=0.3)
+    started, release = threading.Event(), threading.Event()
+
+    def slow():
+        started.set()
+        release.wait(5)
+
+    worker = threading.Thread(target=scheduler.run_exclusive(name, interval, slow))
+    worker.start()
+    started.wait(5)
+    # Well past the original 0.27s lease: renewal keeps other workers out.
+    time.sleep(0.8)
+    assert lease(name).expires_at > datetime.utcnow()
+    assert not scheduler.acquire_lease(name, interval)
+
+    release.set()
+    worker.join(5)
+    # The run overran its tick, so the lease is released at once.
+    assert lease(name).expires_at <= datetime.utcnow()
+    assert scheduler.acquire_lease(name, interval)
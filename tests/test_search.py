@@ -0,0 +1,69 @@
+import uuid
+
+from sqlalchemy import create_engine
+
+from app.models.issues import ensure_sqlite_search_index
+from tests.conftest import login
+
+
+def post_issue(client, headers, title, description):
+    response = client.post("/issues/", data={"title": title, "description": description}, headers=headers)
+    assert response.status_code == 201, response.text
+    return response.json()["id"]
+
+
+def search(client, headers, q):
+    response = client.get("/issues/search", params={"q": q}, headers=headers)
+    assert response.status_code == 200, response.text
+    return response.json()["items"]
+
+
+def test_best_match_comes_first(client, admin_headers):
+    term = f"zq{uuid.uuid4().hex[:8]}"
+    post_issue(client, admin_headers, "Unrelated title", f"Mentions {term} once among many other words here")
+    best = post_issue(client, admin_headers, f"{term} crash", f"{term} {term}")
+    post_issue(client, admin_headers, "No match", "Nothing to see")
+
+    items = search(client, admin_headers, term)
+
+    assert [item["issue"]["id"] for item in items][0] == best
+    assert len(items) == 2
+    assert items[0]["rank"] >= items[1]["rank"]
+    assert items[0]["title_highlight"] == f"<mark>{term}</mark> crash"
+
+
+def test_highlights_escape_issue_text(client, admin_headers):
+    term = f"zq{uuid.uuid4().hex[:8]}"
+    post_issue(client, admin_headers, f"<b>{term}</b> & co", "<script>alert(1)</script>")
+
+    (item,) = search(client, admin_headers, term)
+
+    assert item["title_highlight"] == f"&lt;b&gt;<mark>{term}</mark>&lt;/b&gt; &amp; co"
+    assert "<script>" not in item["description_highlight"]
+
+
+def test_reporters_only_find_their_own_issues(client, admin_headers):
+    term = f"zq{uuid.uuid4().hex[:8]}"
+    email = f"{uuid.uuid4().hex}@example.com"
+    response = client.post("/auth/register", json={"email": email, "password": "reporter-password"})
+    assert response.status_code == 200, response.text
+    headers = login(client, email, "reporter-password")
+    own = post_issue(client, headers, f"Mine {term}", "x")
+    post_issue(client, admin_headers, f"Theirs {term}", "x")
+
+    assert [item["issue"]["id"] for item in search(client, headers, term)] == [own]
+    assert len(search(client, admin_headers, term)) == 2
+
+
+def test_missing_index_is_rebuilt_from_existing_issues(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path}/search.db")
+    with engine.begin() as connection:
+        connection.exec_driver_sql("CREATE TABLE issues (id INTEGER PRIMARY KEY, title TEXT, description TEXT)")
+        connection.exec_driver_sql("INSERT INTO issues VALUES (1, 'Legacy crash', 'Predates the index')")
+        ensure_sqlite_search_index(connection)
+        connection.exec_driver_sql("INSERT INTO issues VALUES (2, 'New crash', 'Indexed by trigger')")
+
+        matches = connection.exec_driver_sql(
+            "SELECT rowid FROM issues_fts WHERE issues_fts MATCH 'crash' ORDER BY rowid"
+        ).scalars().all()
+    assert matches == [1, 2]
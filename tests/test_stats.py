@@ -0,0 +1,58 @@
+from datetime import datetime
+
+from app.crud.stats import bucket_floor, stats_cache
+from app.models.daily_stats import RollupGranularity
+from app.utils.aggregator import aggregate_issue_counts
+
+
+def test_bucket_floor():
+    moment = datetime(2026, 10, 15, 13, 45, 12, 999)  # a Thursday
+    assert bucket_floor(moment, RollupGranularity.HOUR) == datetime(2026, 10, 15, 13)
+    assert bucket_floor(moment, RollupGranularity.DAY) == datetime(2026, 10, 15)
+    assert bucket_floor(moment, RollupGranularity.WEEK) == datetime(2026, 10, 12)
+
+
+def test_series_reports_the_latest_snapshot(client, admin_headers, create_issue):
+    create_issue(admin_headers)
+    aggregate_issue_counts()
+    current = client.get("/stats/current", headers=admin_headers).json()
+
+    response = client.get("/stats/", params={"bucket": "hour", "dimension": "status"}, headers=admin_headers)
+    assert response.status_code == 200
+    latest = response.json()["points"][-1]["bucket_start"]
+    points = {p["value"]: p["count"] for p in response.json()["points"] if p["bucket_start"] == latest}
+    assert points == {status: current["by_status"].get(status, 0) for status in points}
+    assert sum(points.values()) == current["total"]
+
+
+def test_default_window_is_served_from_cache(client, admin_headers):
+    aggregate_issue_counts()
+    assert len(stats_cache) == 0
+
+    first = client.get("/stats/", headers=admin_headers)
+    second = client.get("/stats/", headers=admin_headers)
+    assert first.json()["points"] == second.json()["points"]
+    # Both "now"-relative requests floor to the same bucket, so one entry.
+    assert len(stats_cache) == 1
+
+    aggregate_issue_counts()
+    assert len(stats_cache) == 0
+
+
+def test_timezone_aware_bounds(client, admin_headers):
+    response = client.get("/stats/", params={"start": "2026-10-01T00:00:00Z"}, headers=admin_headers)
+    assert response.status_code == 200
+
+    response = client.get(
+        "/stats/",
+        params={"start": "2026-10-01T00:00:00+02:00", "end": "2026-10-02T00:00:00+02:00"},
+        headers=admin_headers,
+    )
+    assert response.status_code == 200
+
+
+def test_start_after_end_is_rejected(client, admin_headers):
+    response = client.get(
+        "/stats/", params={"start": "2026-10-02T00:00:00", "end": "2026-10-01T00:00:00"}, headers=admin_headers
+    )
+    assert response.status_code == 400
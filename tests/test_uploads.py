@@ -0,0 +1,76 @@
+import os
+
+import pytest
+
+from app.core.config import settings
+from app.utils.storage import attachment_store
+
+
+@pytest.fixture
+def small_uploads(monkeypatch):
+    monkeypatch.setattr(settings, "MAX_UPLOAD_BYTES", 1024)
+    monkeypatch.setattr(settings, "MAX_UPLOAD_FORM_OVERHEAD_BYTES", 1024)
+
+
+def staged_files() -> list[str]:
+    if not os.path.isdir(attachment_store.root):
+        return []
+    return [name for name in os.listdir(attachment_store.root) if name.startswith(".upload-")]
+
+
+def test_file_over_the_cap_is_rejected(client, admin_headers, small_uploads):
+    response = client.post(
+        "/issues/",
+        data={"title": "big", "description": "d"},
+        files={"file": ("big.bin", b"x" * 1500, "application/octet-stream")},
+        headers=admin_headers,
+    )
+    assert response.status_code == 413
+    assert staged_files() == []
+
+
+def test_declared_body_over_the_limit_is_refused_before_parsing(client, admin_headers, small_uploads, monkeypatch):
+    import starlette.requests
+
+    async def never_parse(*args, **kwargs):
+        raise AssertionError("the form should not have been parsed")
+    monkeypatch.setattr(starlette.requests.Request, "form", never_parse)
+
+    response = client.post(
+        "/issues/",
+        data={"title": "huge", "description": "d"},
+        files={"file": ("huge.bin", b"x" * 4096, "application/octet-stream")},
+        headers=admin_headers,
+    )
+    assert response.status_code == 413
+
+
+def test_chunked_body_over_the_limit_is_cut_off(client, admin_headers, small_uploads):
+    # The file itself is under the cap; the body as a whole is not.
+    boundary = "limit-test"
+    description = "d" * 3000
+    body = (
+        f"--{boundary}\r\nContent-Disposition: form-data; name=\"title\"\r\n\r\nchunked\r\n"
+        f"--{boundary}\r\nContent-Disposition: form-data; name=\"description\"\r\n\r\n{description}\r\n"
+        f"--{boundary}\r\nContent-Disposition: form-data; name=\"file\"; filename=\"c.bin\"\r\n"
+        "Content-Type: application/octet-stream\r\n\r\n"
+    ).encode() + b"x" * 1000 + f"\r\n--{boundary}--\r\n".encode()
+
+    def chunks():
+        for start in range(0, len(body), 512):
+            yield body[start:start + 512]
+
+    response = client.post(
+        "/issues/",
+        content=chunks(),
+        headers={**admin_headers, "Content-Type": f"multipart/form-data; boundary={boundary}"},
+    )
+    assert response.status_code == 413
+
+
+def test_bulk_ndjson_is_not_capped(client, admin_headers, small_uploads):
+    lines = b"\n".join(b'{"title":"not capped","description":"%s"}' % (b"d" * 200) for _ in range(20))
+    response = client.post(
+        "/issues/bulk", content=lines, headers={**admin_headers, "Content-Type": "application/x-ndjson"}
+    )
+    assert response.status_code == 201